@@ -1,4 +1,5 @@
 from .constants import BITFIELD, DOUBLE, IGNORE, INTEGER, REAL, STRING, DataType
+from .dataset import Dataset, dataset
 from .encoder import encode_odb
 from .frame import ColumnInfo, Frame
 from .lib import ODCException
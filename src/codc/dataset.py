@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pyodc.dataset import Dataset as _Dataset
+
+from .reader import Reader, read_odb
+
+
+def _decode_file(path, columns):
+    return read_odb(path, columns=columns, single=True)
+
+
+class Dataset(_Dataset):
+    __doc__ = _Dataset.__doc__
+
+    # odc releases the GIL while decoding, so files are decoded concurrently on threads
+    _reader = Reader
+    _decode_file = staticmethod(_decode_file)
+    _executor = ThreadPoolExecutor
+
+
+def dataset(source, filter=None, workers=None):
+    """
+    Open a collection of ODB-2 files as a single dataset (see :class:`.Dataset`)
+
+    Parameters:
+        source(str|list): A directory, file, or glob pattern, or a list of these
+        filter(dict): Conditions on the partition keys of the files to read
+        workers(int): The number of files to scan or decode concurrently
+
+    Returns:
+        Dataset
+    """
+    return Dataset(source, filter=filter, workers=workers)
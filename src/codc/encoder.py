@@ -1,16 +1,27 @@
 import pandas
 
+from pyodc.encoder import frame_rows_for_size, rechunk_dataframes, sort_frame
+
 from .constants import BITFIELD, DOUBLE, INTEGER, REAL, STRING
 from .lib import ffi, lib
 
 
 def encode_odb(
-    df: pandas.DataFrame, f, types: dict = None, rows_per_frame=10000, properties=None, bitfields: dict = None, **kwargs
+    df: pandas.DataFrame,
+    f,
+    types: dict = None,
+    rows_per_frame=10000,
+    properties=None,
+    bitfields: dict = None,
+    sort_within_frame=None,
+    target_frame_bytes: int = None,
+    **kwargs,
 ):
     """
     Encode a pandas dataframe into ODB2 format
 
-    :param df: The dataframe to encode
+    :param df: The dataframe to encode, or an iterable of dataframes, pyarrow record batches, or dicts of
+               column-name : array pairs. The rows are regrouped into frames as they are read
     :param f: The file-like object into which to encode the ODB2 data
     :param types: An optional (sparse) dictionary. Each key-value pair maps the name of a column to
                   encode to an ODB2 data type to use to encode it.
@@ -18,12 +29,44 @@ def encode_odb(
                            a sequence of frames will be encoded
     :param bitfields: A dictionary containing entries for BITFIELD columns. The values are either bitfield names, or
                       tuple pairs of bitfield name and bitfield size
+    :param sort_within_frame: Reorder the rows within each frame, sorting them by these columns. If "auto", rows are
+                              sorted by the columns with few distinct values in each frame, fewest first
+    :param target_frame_bytes: Size frames to encode to about this many bytes each, rather than a fixed number of
+                               rows. The number of rows in each frame is estimated from the rows at its start
     :param kwargs: Accept extra arguments that may be used by the python pyodc encoder.
     :return:
     """
     if isinstance(f, str):
         with open(f, "wb") as freal:
-            return encode_odb(df, freal, types=types, rows_per_frame=rows_per_frame, properties=properties, **kwargs)
+            return encode_odb(
+                df,
+                freal,
+                types=types,
+                rows_per_frame=rows_per_frame,
+                properties=properties,
+                bitfields=bitfields,
+                sort_within_frame=sort_within_frame,
+                target_frame_bytes=target_frame_bytes,
+                **kwargs,
+            )
+
+    # Frames are encoded one at a time if they must be regrouped, resized or reordered first
+    if not isinstance(df, pandas.DataFrame) or sort_within_frame is not None or target_frame_bytes is not None:
+        if target_frame_bytes is not None:
+            rows_per_frame = frame_rows_for_size(target_frame_bytes, types, bitfields)
+        for frame in rechunk_dataframes(df, rows_per_frame):
+            if sort_within_frame is not None:
+                frame = sort_frame(frame, sort_within_frame)
+            encode_odb(
+                frame,
+                f,
+                types=types,
+                rows_per_frame=len(frame),
+                properties=properties,
+                bitfields=bitfields,
+                **kwargs,
+            )
+        return
 
     # Some constants that are useful
 
@@ -12,6 +12,9 @@ import os
 import numpy as np
 import pandas
 
+from pyodc.codec import categorical_column, decoded_column, integer_dtype, nullable_column
+from pyodc.frame import check_strings, extract_nullable_bitfield
+
 
 # A null-terminated UTF-8 decoder
 def null_utf_decoder(name):
@@ -32,6 +35,52 @@ def null_utf_decoder(name):
 codecs.register(null_utf_decoder)
 
 
+def available_threads():
+    """
+    The number of CPUs available to this process
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count()
+
+
+def _integer_column(values, missing, nullable, downcast):
+    """
+    Build an integer column from the decoded values and the flags of which are missing. The codecs are not exposed
+    by odc, so any narrower dtype is found from the range of the values themselves.
+    """
+    dtype = None
+    if downcast:
+        present = values[~missing]
+        if len(present) > 0:
+            dtype = integer_dtype(present.min(), present.max(), missing.any(), nullable)
+        else:
+            dtype = np.dtype(np.int8 if nullable else np.float32)
+    if nullable:
+        return nullable_column(values, missing, dtype=dtype)
+    return decoded_column(values, missing, None, dtype=dtype)
+
+
+def _real_column(values, missing):
+    """
+    Build a real column from the decoded values and the flags of which are missing, with single precision if that
+    holds every value exactly
+    """
+    present = values[~missing]
+    exact = np.array_equal(present.astype(np.float32), present, equal_nan=True)
+    return decoded_column(values, missing, None, dtype=np.dtype(np.float32) if exact else None)
+
+
+def _categorical(values):
+    """
+    Build a categorical column from an array of fixed-width encoded strings
+    """
+    categories, codes = np.unique(values, return_inverse=True)
+    categories = pandas.Series(categories.astype(object), dtype=object).str.decode("utf_8_null")
+    return categorical_column(codes.reshape(-1), categories, "")
+
+
 class ColumnInfo:
     class Bitfield:
         def __init__(self, name, size, offset):
@@ -170,7 +219,9 @@ class Frame:
 
         return properties
 
-    def dataframe(self, columns=None):
+    def dataframe(self, columns=None, threads=None, strings="object", nullable=False, downcast=False):
+        check_strings(strings)
+
         # Are there any bitfield columns we need to consider?
         original_columns = columns
         bitfields = []
@@ -200,7 +251,7 @@ class Frame:
                         bitfields.append((bitfield_name, column_name, colname))
             columns = list(final_columns)
 
-        df = self._dataframe_internal(columns)
+        df = self._dataframe_internal(columns, threads=threads, strings=strings, nullable=nullable, downcast=downcast)
 
         # If there are any bitfields that need extraction, do it here, and remove any temporarily
         # decoded columns as is possible
@@ -214,10 +265,15 @@ class Frame:
                 except StopIteration:
                     raise KeyError(f"Bitfield '{bitfield_name}' not found")
 
-                # If there are missing values in the column, then it will have been decoded as a float64 to support NaN
+                # If there are missing values in the column, then it will have been decoded as a float64 to support NaN,
+                # unless it has been decoded as a nullable integer column, which can be extracted from directly
                 raw_column = df[column_name]
                 missing_vals = None
-                if raw_column.dtype == np.float64:
+                if isinstance(raw_column.array, pandas.arrays.IntegerArray):
+                    df[output_name] = extract_nullable_bitfield(raw_column.array, bf)
+                    extracted_columns.add(column_name)
+                    continue
+                if raw_column.dtype.kind == "f":
                     missing_vals = np.isnan(raw_column)
                     raw_column = raw_column.fillna(value=0).astype("int64")
 
@@ -243,7 +299,7 @@ class Frame:
 
         return df
 
-    def _dataframe_internal(self, columns=None):
+    def _dataframe_internal(self, columns=None, threads=None, strings="object", nullable=False, downcast=False):
         # Some constants that are useful
 
         pmissing_integer = ffi.new("long*")
@@ -288,7 +344,7 @@ class Frame:
 
         lib.odc_decoder_set_row_count(decoder, self.nrows)
 
-        dataframes = []
+        blocks = []
         pos = 0
         string_seq = tuple((cols, "|S{}".format(dataSize), dataSize) for dataSize, cols in string_cols.items())
         for cols, dtype, dsize in (
@@ -314,12 +370,10 @@ class Frame:
                     )
                     pos += 1
 
-                dataframes.append(pandas.DataFrame(array, columns=colnames, copy=False))
+                blocks.append((array, colnames))
 
-        try:
-            threads = len(os.shed_getaffinity(0))
-        except AttributeError:
-            threads = os.cpu_count()
+        if threads is None:
+            threads = available_threads()
 
         prows_decoded = ffi.new("long*")
         lib.odc_decode_threaded(decoder, self.__frame, prows_decoded, threads)
@@ -327,20 +381,41 @@ class Frame:
 
         # Update the missing values (n.b., still sorted by type), and decode strings
 
-        for i in range(len(dataframes)):
-            df = dataframes[i]
-            if df.dtypes.iloc[0] == np.int64:
+        dataframes = []
+        for array, colnames in blocks:
+            if array.dtype == np.int64 and (nullable or downcast):
+                # The missing values are found once, and each column built with them, rather than the block
+                # being converted to float64
+                missing = array == missing_integer
+                df = pandas.DataFrame(
+                    {
+                        name: _integer_column(array[:, i], missing[:, i], nullable, downcast)
+                        for i, name in enumerate(colnames)
+                    }
+                )
+            elif array.dtype == np.double and downcast:
+                missing = array == missing_double
+                df = pandas.DataFrame(
+                    {name: _real_column(array[:, i], missing[:, i]) for i, name in enumerate(colnames)}
+                )
+            elif array.dtype == np.int64:
+                df = pandas.DataFrame(array, columns=colnames, copy=False)
                 df.mask(df == missing_integer, inplace=True)
-            elif df.dtypes.iloc[0] == np.double:
+            elif array.dtype == np.double:
+                df = pandas.DataFrame(array, columns=colnames, copy=False)
                 df.mask(df == missing_double, inplace=True)
+            elif strings == "categorical":
+                # Only the distinct strings are decoded, and each column is built from its codes into them
+                df = pandas.DataFrame({name: _categorical(array[:, i]) for i, name in enumerate(colnames)})
             else:
                 # This is a bit yucky, but I haven't found any other way to decode from b'' strings to real ones
                 # Also note, result_type added to work around bug in pandas
                 # https://github.com/pandas-dev/pandas/issues/34529
-                dataframes[i] = df.apply(
+                df = pandas.DataFrame(array, columns=colnames, copy=False).apply(
                     lambda x: x.astype("object").str.decode("utf_8_null"),
                     result_type="expand",
                 )
+            dataframes.append(df)
 
         # And construct the DataFrame from the decoded data
 
@@ -1,8 +1,12 @@
 import io
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas
 
-from .frame import Frame
+from pyodc.frame import check_strings, unify_categories
+from pyodc.parallel import ordered_map
+
+from .frame import Frame, available_threads
 from .lib import ffi, lib
 
 
@@ -16,6 +20,10 @@ class Reader:
         self.__aggregated = aggregated
         self.__max_aggregated = max_aggregated
 
+        # odc's integer behaviour is a per-thread setting, captured by the frames read here, so it is set in
+        # whichever thread opens the reader rather than relying on the thread that loaded the library
+        lib.odc_integer_behaviour(lib.ODC_INTEGERS_AS_LONGS)
+
         reader = ffi.new("odc_reader_t**")
         if isinstance(source, io.IOBase):
             lib.odc_open_file_descriptor(reader, source.fileno())
@@ -46,23 +54,74 @@ class Reader:
         return self.__frames
 
 
-def _read_odb_generator(source, columns=None, aggregated=True, max_aggregated=-1):
+def _read_odb_generator(
+    source, columns=None, aggregated=True, max_aggregated=-1, strings="object", nullable=False, downcast=False
+):
     r = Reader(source, aggregated=aggregated, max_aggregated=max_aggregated)
     for f in r.frames:
-        yield f.dataframe(columns)
+        yield f.dataframe(columns, strings=strings, nullable=nullable, downcast=downcast)
+
+
+def _read_odb_threaded(
+    source,
+    columns=None,
+    aggregated=True,
+    max_aggregated=-1,
+    workers=None,
+    strings="object",
+    nullable=False,
+    downcast=False,
+):
+    """
+    Decode several frames at once on a pool of threads. odc releases the GIL while decoding, and the available
+    CPUs are shared out between the frames being decoded concurrently, and the columns decoded within each frame.
+    """
+    r = Reader(source, aggregated=aggregated, max_aggregated=max_aggregated)
+    threads = max(1, available_threads() // workers)
 
+    with ThreadPoolExecutor(workers) as executor:
+        tasks = ((f, columns, threads, strings, nullable, downcast) for f in r.frames)
+        yield from ordered_map(executor, Frame.dataframe, tasks, 2 * workers)
 
-def _read_odb_oneshot(source, columns=None):
-    reduced = pandas.concat(_read_odb_generator(source, columns), sort=False, ignore_index=True)
+
+def _read_odb_oneshot(dataframes):
+    reduced = pandas.concat(unify_categories(dataframes), sort=False, ignore_index=True)
     for name, data in reduced.items():
         if data.dtype == "object":
             data.where(pandas.notnull(data), None, inplace=True)
     return reduced
 
 
-def read_odb(source, columns=None, aggregated=True, single=False, max_aggregated=-1):
+def read_odb(
+    source,
+    columns=None,
+    aggregated=True,
+    single=False,
+    max_aggregated=-1,
+    workers=None,
+    strings="object",
+    nullable=False,
+    downcast=False,
+):
+    check_strings(strings)
+    if workers is not None and workers > 1:
+        dataframes = _read_odb_threaded(
+            source,
+            columns,
+            aggregated,
+            max_aggregated,
+            workers=workers,
+            strings=strings,
+            nullable=nullable,
+            downcast=downcast,
+        )
+    else:
+        dataframes = _read_odb_generator(
+            source, columns, aggregated, max_aggregated, strings=strings, nullable=nullable, downcast=downcast
+        )
+
     if single:
         assert aggregated
-        return _read_odb_oneshot(source, columns)
+        return _read_odb_oneshot(dataframes)
     else:
-        return _read_odb_generator(source, columns, aggregated, max_aggregated)
+        return dataframes
@@ -1,5 +1,6 @@
 from .constants import BITFIELD, DOUBLE, IGNORE, INTEGER, REAL, STRING, DataType
-from .encoder import encode_odb
+from .dataset import Dataset, dataset
+from .encoder import ColumnOrdering, Writer, encode_odb, optimise_column_order
 from .frame import ColumnInfo, Frame
 from .reader import Reader, read_odb
 
@@ -1,12 +1,200 @@
 import os
 import struct
+from functools import cached_property
 
+import numpy as np
 import pandas as pd
 
 from .constants import INTERNAL_REAL_MISSING, MISSING_INTEGER, MISSING_REAL, MISSING_STRING, DataType
 
 
+def _gather(buffer, offsets, dtype):
+    """
+    Extract the values of the given (fixed width) dtype stored at the given byte offsets of a uint8 buffer
+    """
+    if dtype.itemsize == 1:
+        return buffer[offsets].view(dtype)
+    return buffer[offsets[:, None] + np.arange(dtype.itemsize)].view(dtype)[:, 0]
+
+
+def decoded_column(values, missing, missing_value, leading=0, dtype=None):
+    """
+    Combine an array of decoded values, the flags marking which of them are missing, and a count of leading
+    rows that are missing, into a column with the types pandas would infer from a list of the decoded values.
+    If a (numeric) dtype is given, the column has that dtype instead, so long as it can hold the missing values.
+    """
+    nrows = leading + len(values)
+    if missing is None or not missing.any():
+        if leading == 0:
+            return values if dtype is None else values.astype(dtype, copy=False)
+        missing = np.zeros(len(values), dtype=bool)
+
+    if dtype is not None and dtype.kind != "f":
+        dtype = None
+
+    missing = np.concatenate((np.ones(leading, dtype=bool), missing))
+    if missing.all():
+        if dtype is not None:
+            return np.full(nrows, np.nan, dtype=dtype)
+        return np.full(nrows, missing_value, dtype=object)
+
+    if missing_value is None:
+        column = np.empty(nrows, dtype=dtype or np.float64)
+        column[leading:] = values
+        column[missing] = np.nan
+    else:
+        column = np.empty(nrows, dtype=object)
+        column[leading:] = values
+        column[missing] = missing_value
+    return column
+
+
+def nullable_column(values, missing, leading=0, dtype=None):
+    """
+    Build a pandas nullable integer column from an array of decoded values, the flags marking which of them are
+    missing, and a count of leading rows that are missing. The values are not converted through floating point.
+    """
+    valid = np.ones(len(values), dtype=bool) if missing is None else ~missing
+    data = np.zeros(leading + len(values), dtype=dtype or np.int64)
+    data[leading:][valid] = values[valid]
+    mask = np.ones(leading + len(values), dtype=bool)
+    mask[leading:] = ~valid
+    return pd.arrays.IntegerArray(data, mask)
+
+
+def integer_dtype(lo, hi, missing=False, nullable=False):
+    """
+    The smallest dtype that holds all of the integers from lo to hi. Missing values are represented by NaN, which
+    needs a floating point dtype that holds the integers exactly, unless they are masked in a nullable column.
+
+    Returns:
+        dtype: The dtype, or ``None`` if there is no narrower dtype than the default
+    """
+    if missing and not nullable:
+        return np.dtype(np.float32) if -(2**24) <= lo and hi <= 2**24 else None
+    for dtype in (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32):
+        if np.iinfo(dtype).min <= lo and hi <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return None
+
+
+def real_dtype(value):
+    """
+    The smallest dtype that holds a real value exactly
+
+    Returns:
+        dtype: The dtype, or ``None`` if there is no narrower dtype than the default
+    """
+    return np.dtype(np.float32) if np.isnan(value) or float(np.float32(value)) == value else None
+
+
+def categorical_column(codes, categories, missing_value, leading=0):
+    """
+    Build a categorical column from the codes of a string column into its dictionary of categories, and a count of
+    leading rows that are missing. Duplicate categories are merged, as pandas requires the categories to be unique.
+    """
+    categories = pd.Index(categories, dtype=object)
+    if not categories.is_unique:
+        unique = categories.unique()
+        codes = unique.get_indexer(categories)[codes]
+        categories = unique
+
+    if leading:
+        if missing_value not in categories:
+            categories = categories.append(pd.Index([missing_value], dtype=object))
+        codes = np.concatenate((np.full(leading, categories.get_loc(missing_value)), codes))
+
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _split_missing(values):
+    """
+    Separate an array-like of values to encode into an array with the missing values zeroed, and the
+    flags of which values are missing
+    """
+    values = np.asarray(values)
+    missing = np.asarray(pd.isnull(values))
+    if missing.any():
+        values = np.where(missing, 0, values)
+    if values.dtype == object:
+        values = values.astype(np.float64)
+    return values, missing
+
+
+class ColumnStatistics:
+    """
+    Summary statistics of a column of data to be encoded, used to choose its codec, fill in the codec header and
+    order the columns. Each statistic is computed with NumPy the first time it is needed, and then reused.
+
+    Parameters:
+        data(Series): The column of data
+    """
+
+    def __init__(self, data: pd.Series):
+        self.values = data.to_numpy()
+        self.missing = np.asarray(pd.isnull(self.values))
+        self.has_missing = bool(self.missing.any())
+        self.all_missing = bool(self.missing.all())
+
+    @cached_property
+    def present(self):
+        """The values which are not missing"""
+        return self.values[~self.missing] if self.has_missing else self.values
+
+    @cached_property
+    def unique(self):
+        """The distinct values which are not missing, in order of appearance"""
+        return pd.unique(self.present)
+
+    @property
+    def cardinality(self):
+        return len(self.unique)
+
+    @cached_property
+    def min(self):
+        return self.present.min() if len(self.present) else np.nan
+
+    @cached_property
+    def max(self):
+        return self.present.max() if len(self.present) else np.nan
+
+    @cached_property
+    def is_integral(self):
+        """Whether every value which is not missing is a whole number"""
+        # Infinities are not whole numbers, and must not warn about it
+        with np.errstate(invalid="ignore"):
+            return bool(np.all(np.mod(self.present, 1) == 0))
+
+    @cached_property
+    def is_string(self):
+        """Whether every value is a string or ``None``"""
+        return pd.api.types.infer_dtype(self.present, skipna=False) in ("string", "empty") and all(
+            v is None for v in self.values[self.missing]
+        )
+
+    def num_changes(self, missing_value=None):
+        """
+        The number of rows whose value differs from that in the previous row
+
+        Parameters:
+            missing_value: The value to substitute for missing values before comparing them, if any
+        """
+        values = self.values
+        if missing_value is not None and self.has_missing:
+            values = np.where(self.missing, missing_value, values)
+        if values.dtype.kind in "iuf":
+            # Compare by difference, so that (as in pandas) repeated infinities count as changes
+            with np.errstate(invalid="ignore"):
+                return int(np.count_nonzero(np.diff(values) != 0))
+        return int(np.count_nonzero(values[1:] != values[:-1]))
+
+
 class Codec:
+    # The type used to store each value in the data section, or None if no per-row data is stored
+    encoded_dtype = None
+    # Whether the column has the same value in every row, given by the header (see decode(None))
+    constant = False
+
     def __init__(
         self,
         column_name: str,
@@ -57,6 +245,22 @@ class Codec:
         """
         return 8
 
+    @property
+    def encoded_size(self):
+        """
+        Size of each encoded value in the data section in bytes.
+        """
+        return 0 if self.encoded_dtype is None else np.dtype(self.encoded_dtype).itemsize
+
+    def _encoded_dtype(self, byteorder):
+        return np.dtype(self.encoded_dtype).newbyteorder("<" if byteorder == "little" else ">")
+
+    def _read_array(self, buffer, offsets, byteorder):
+        return _gather(buffer, offsets, self._encoded_dtype(byteorder))
+
+    def _write_array(self, raw, byteorder):
+        return raw.astype(self._encoded_dtype(byteorder)).tobytes()
+
     def encode_header(self, stream):
         stream.encodeString(str(self.column_name))
         stream.encodeInt32(self.type)
@@ -85,7 +289,7 @@ class Codec:
         return has_missing, minval, maxval, missing_value
 
     @classmethod
-    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields):
+    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields, statistics=None):
         raise NotImplementedError
 
     @classmethod
@@ -107,6 +311,75 @@ class Codec:
     def decode(self, stream):
         raise NotImplementedError
 
+    def encode_array(self, values, byteorder="little"):
+        """
+        Encode an array of values in bulk, equivalent to calling :meth:`encode` for each value in turn.
+
+        Parameters:
+            values(array-like): The values to encode
+            byteorder(str): Either ``"little"`` or ``"big"``
+
+        Returns:
+            bytes: The concatenated encoded values
+        """
+        raise NotImplementedError
+
+    def decode_array(self, buffer, offsets, byteorder="little"):
+        """
+        Decode values in bulk from a raw buffer, equivalent to calling :meth:`decode` at each offset.
+
+        Parameters:
+            buffer(bytes-like): The raw encoded data
+            offsets(array-like): The byte offset within the buffer of each value to decode
+            byteorder(str): Either ``"little"`` or ``"big"``
+
+        Returns:
+            ndarray: The decoded values. Missing values are ``NaN`` for numeric columns where possible,
+                     or ``None`` otherwise
+        """
+        if not isinstance(buffer, np.ndarray):
+            buffer = np.frombuffer(buffer, dtype=np.uint8)
+        values, missing = self._decode_array(buffer, np.asarray(offsets, dtype=np.int64), byteorder)
+        return decoded_column(values, missing, self.typed_missing_value)
+
+    def _decode_array(self, buffer, offsets, byteorder, dtype=None):
+        """
+        Decode the values stored at the given byte offsets of a uint8 buffer in bulk.
+
+        Parameters:
+            dtype(dtype): A narrower (numeric) dtype to decode the values into, which holds every value that is not
+                          missing (see :meth:`narrow_dtype`). If ``None``, the default dtype is used
+
+        Returns:
+            tuple: An array of decoded values, and a boolean array flagging missing values (or ``None``)
+        """
+        raise NotImplementedError
+
+    def narrow_dtype(self, missing=False, nullable=False):
+        """
+        The smallest dtype that holds every value this codec can decode, according to its header.
+
+        Parameters:
+            missing(bool): Whether the column may contain missing values
+            nullable(bool): Whether missing integer values are masked in a nullable column, rather than being NaN
+
+        Returns:
+            dtype: The dtype, or ``None`` if there is no narrower dtype than the default
+        """
+        return None
+
+    def _decode_codes(self, buffer, offsets, byteorder):
+        """
+        Decode the values of a string column stored at the given byte offsets of a uint8 buffer in bulk, as codes
+        into a dictionary of the distinct values.
+
+        Returns:
+            tuple: An array of codes, and the values that they index
+        """
+        values, _ = self._decode_array(buffer, offsets, byteorder)
+        codes, categories = pd.factorize(values)
+        return codes, categories
+
     @property
     def numChanges(self):
         raise NotImplementedError
@@ -116,9 +389,12 @@ class Codec:
 
 
 class Constant(Codec):
+    constant = True
+
     @classmethod
-    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields: list):
-        assert data.nunique() == 1 and not data.hasnans
+    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields: list, statistics=None):
+        statistics = statistics or ColumnStatistics(data)
+        assert statistics.cardinality == 1 and not statistics.has_missing
         value = next(iter(data))
 
         if bitfields:
@@ -142,11 +418,25 @@ class Constant(Codec):
     def encode(self, stream, value):
         pass
 
+    def encode_array(self, values, byteorder="little"):
+        return b""
+
     def decode(self, stream):
         return {DataType.INTEGER: int, DataType.REAL: float, DataType.DOUBLE: float, DataType.BITFIELD: int}[self.type](
             self.min
         )
 
+    def _decode_array(self, buffer, offsets, byteorder, dtype=None):
+        value = self.decode(None)
+        return np.full(len(offsets), value, dtype=object if isinstance(value, str) else dtype), None
+
+    def narrow_dtype(self, missing=False, nullable=False):
+        if self.type in (DataType.INTEGER, DataType.BITFIELD):
+            return integer_dtype(int(self.min), int(self.min), missing, nullable)
+        if self.type in (DataType.REAL, DataType.DOUBLE):
+            return real_dtype(self.min)
+        return None
+
     @property
     def numChanges(self):
         return 0
@@ -154,8 +444,9 @@ class Constant(Codec):
 
 class ConstantString(Constant):
     @classmethod
-    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields):
-        assert data.nunique() == 1 and not data.hasnans
+    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields, statistics=None):
+        statistics = statistics or ColumnStatistics(data)
+        assert statistics.cardinality == 1 and not statistics.has_missing
         assert data_type == DataType.STRING
         assert not bitfields
 
@@ -171,11 +462,12 @@ class ConstantString(Constant):
 
 class NumericBase(Codec):
     _numChanges = None
-    _data = None
+    _statistics = None
     accepted_types = None
 
     @classmethod
-    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields):
+    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields, statistics=None):
+        statistics = statistics or ColumnStatistics(data)
         assert data_type in cls.accepted_types
         if bitfields:
             assert data_type == DataType.BITFIELD
@@ -186,32 +478,34 @@ class NumericBase(Codec):
             bitfield_sizes = []
         c = cls(
             column_name,
-            data.min(),
-            data.max(),
+            statistics.min,
+            statistics.max,
             data_type,
-            has_missing=data.hasnans,
+            has_missing=statistics.has_missing,
             bitfield_names=bitfield_names,
             bitfield_sizes=bitfield_sizes,
         )
-        c._data = data
+        c._statistics = statistics
         return c
 
     @property
     def numChanges(self):
         if self._numChanges is None:
-            assert self._data is not None
-            self._numChanges = (self._data.fillna(self.missing_value).diff() != 0).sum() - 1
+            assert self._statistics is not None
+            self._numChanges = self._statistics.num_changes(self.missing_value)
         return self._numChanges
 
 
 class ConstantOrMissing(NumericBase):
     internal_missing_value = 0xFF
+    encoded_dtype = "u1"
     accepted_types = (DataType.INTEGER, DataType.BITFIELD)
 
     @classmethod
-    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields):
-        assert data.nunique() == 1 and data.hasnans
-        return super().from_dataframe(column_name, data, data_type, bitfields)
+    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields, statistics=None):
+        statistics = statistics or ColumnStatistics(data)
+        assert statistics.cardinality == 1 and statistics.has_missing
+        return super().from_dataframe(column_name, data, data_type, bitfields, statistics)
 
     def encode(self, stream, value):
         if pd.isnull(value):
@@ -219,6 +513,10 @@ class ConstantOrMissing(NumericBase):
         else:
             stream.encodeUInt8(0)
 
+    def encode_array(self, values, byteorder="little"):
+        _, missing = _split_missing(values)
+        return self._write_array(np.where(missing, self.internal_missing_value, 0), byteorder)
+
     def decode(self, stream):
         marker = stream.readUInt8()
         if marker == self.internal_missing_value:
@@ -228,6 +526,18 @@ class ConstantOrMissing(NumericBase):
                 self.type
             ](self.min)
 
+    def _decode_array(self, buffer, offsets, byteorder, dtype=None):
+        markers = self._read_array(buffer, offsets, byteorder)
+        value = {DataType.INTEGER: int, DataType.REAL: float, DataType.DOUBLE: float, DataType.BITFIELD: int}[
+            self.type
+        ](self.min)
+        return np.full(len(offsets), value, dtype=dtype), markers == self.internal_missing_value
+
+    def narrow_dtype(self, missing=False, nullable=False):
+        if self.type in (DataType.INTEGER, DataType.BITFIELD):
+            return integer_dtype(int(self.min), int(self.min), True, nullable)
+        return real_dtype(self.min)
+
 
 class RealConstantOrMissing(ConstantOrMissing):
     accepted_types = (DataType.DOUBLE, DataType.REAL)
@@ -254,13 +564,41 @@ class OffsetInteger(NumericBase):
             assert value - self.min <= self.max_range
             self._encode(stream, int(value - self.min))
 
+    def encode_array(self, values, byteorder="little"):
+        values, missing = _split_missing(values)
+        assert self.internal_missing_value is not None or not missing.any()
+        assert np.all(np.mod(values, 1) == 0)
+        # Missing values are zeroed, which is out of range if the minimum is far enough below zero
+        raw = np.where(missing, 0, values - self.min)
+        assert np.all(raw <= self.max_range)
+        raw = raw.astype(np.int64)
+        raw[missing] = self.internal_missing_value or 0
+        return self._write_array(raw, byteorder)
+
     def decode(self, stream):
         value = self._decode(stream)
         return None if value == self.internal_missing_value else int(value + self.min)
 
+    def _decode_array(self, buffer, offsets, byteorder, dtype=None):
+        raw = self._read_array(buffer, offsets, byteorder)
+        missing = None if self.internal_missing_value is None else raw == self.internal_missing_value
+        if dtype is None:
+            return raw.astype(np.int64) + int(self.min), missing
+
+        # The offsets are added in a dtype that also holds the encoded offsets themselves. Missing values may wrap
+        # around, but are masked.
+        values = raw.astype(np.promote_types(dtype, raw.dtype))
+        values += int(self.min)
+        return values.astype(dtype, copy=False), missing
+
+    def narrow_dtype(self, missing=False, nullable=False):
+        # The values are offsets from the minimum, so their range is also bounded by the encoded width
+        return integer_dtype(int(self.min), min(int(self.max), int(self.min) + self.max_range), missing, nullable)
+
 
 class Int8(OffsetInteger):
     max_range = 0xFF
+    encoded_dtype = "u1"
     accepts_missing = False
 
     @staticmethod
@@ -280,6 +618,7 @@ class Int8Missing(Int8):
 
 class Int16(OffsetInteger):
     max_range = 0xFFFF
+    encoded_dtype = "u2"
     accepts_missing = False
 
     @staticmethod
@@ -302,12 +641,14 @@ class Int32(NumericBase):
     accepts_missing = True
     internal_missing_value = 0x7FFFFFFF
     accepted_types = (DataType.INTEGER, DataType.BITFIELD)
+    encoded_dtype = "i4"
 
     @classmethod
-    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields):
-        if data.min() < -0x80000000 or data.max() >= 0x7FFFFFFF:
+    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields, statistics=None):
+        statistics = statistics or ColumnStatistics(data)
+        if statistics.min < -0x80000000 or statistics.max >= 0x7FFFFFFF:
             raise ValueError("Cannot encode integers out of range")
-        c = super().from_dataframe(column_name, data, data_type, bitfields)
+        c = super().from_dataframe(column_name, data, data_type, bitfields, statistics)
         assert c.missing_value == c.internal_missing_value
         return c
 
@@ -317,24 +658,45 @@ class Int32(NumericBase):
         else:
             stream.encodeInt32(int(value))
 
+    def encode_array(self, values, byteorder="little"):
+        values, missing = _split_missing(values)
+        raw = values.astype(np.int64)
+        raw[missing] = self.internal_missing_value
+        return self._write_array(raw, byteorder)
+
     def decode(self, stream):
         value = stream.readInt32()
         return None if value == self.internal_missing_value else value
 
+    def _decode_array(self, buffer, offsets, byteorder, dtype=None):
+        raw = self._read_array(buffer, offsets, byteorder)
+        return raw.astype(dtype or np.int64), raw == self.internal_missing_value
+
+    def narrow_dtype(self, missing=False, nullable=False):
+        return integer_dtype(max(int(self.min), -0x80000000), min(int(self.max), 0x7FFFFFFF), missing, nullable)
+
 
 class LongReal(NumericBase):
     accepted_types = (DataType.DOUBLE, DataType.REAL)
+    encoded_dtype = "f8"
 
     def encode(self, stream, value):
         stream.encodeReal64(value)
 
+    def encode_array(self, values, byteorder="little"):
+        return self._write_array(np.asarray(values, dtype=np.float64), byteorder)
+
     def decode(self, stream):
         return stream.readReal64()
 
+    def _decode_array(self, buffer, offsets, byteorder, dtype=None):
+        return self._read_array(buffer, offsets, byteorder).astype(dtype or np.float64), None
+
 
 class ShortReal(NumericBase):
     internal_missing_value = INTERNAL_REAL_MISSING[0]
     accepted_types = (DataType.DOUBLE, DataType.REAL)
+    encoded_dtype = "f4"
 
     def encode(self, stream, value):
         if pd.isnull(value) is None:
@@ -343,10 +705,25 @@ class ShortReal(NumericBase):
             assert value != self.internal_missing_value
             stream.encodeReal32(value)
 
+    def encode_array(self, values, byteorder="little"):
+        values = np.asarray(values, dtype=np.float64)
+        assert not np.any(values == self.internal_missing_value)
+        if np.any(np.isfinite(values) & (np.abs(values) > np.finfo(np.float32).max)):
+            raise OverflowError("float too large to pack with f format")
+        return self._write_array(values, byteorder)
+
     def decode(self, stream):
         value = stream.readReal32()
         return None if value == self.internal_missing_value else value
 
+    def _decode_array(self, buffer, offsets, byteorder, dtype=None):
+        raw = self._read_array(buffer, offsets, byteorder)
+        return raw.astype(dtype or np.float64), raw == np.float32(self.internal_missing_value)
+
+    def narrow_dtype(self, missing=False, nullable=False):
+        # The values are encoded with single precision
+        return np.dtype(np.float32)
+
 
 class ShortReal2(ShortReal):
     internal_missing_value = INTERNAL_REAL_MISSING[1]
@@ -355,10 +732,11 @@ class ShortReal2(ShortReal):
 class Int8String(Codec):
     missing_value = MISSING_INTEGER
     type = DataType.STRING
+    encoded_dtype = "u1"
     _numChanges = None
 
-    def __init__(self, *args, values=None, data=None, **kwargs):
-        self._data = data
+    def __init__(self, *args, values=None, statistics=None, **kwargs):
+        self._statistics = statistics
         assert values is not None
         self.values = values
         self.value_map = {value: i for i, value in enumerate(values)}
@@ -366,11 +744,12 @@ class Int8String(Codec):
         super().__init__(*args, **kwargs)
 
     @classmethod
-    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields):
-        assert not data.hasnans
+    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields, statistics=None):
+        statistics = statistics or ColumnStatistics(data)
+        assert not statistics.has_missing
         assert data_type == DataType.STRING
         assert not bitfields
-        return cls(column_name, 0, 0, data_type, values=data.unique(), data=data)
+        return cls(column_name, 0, 0, data_type, values=statistics.unique, statistics=statistics)
 
     @classmethod
     def from_stream(cls, stream, column_name: str, data_type: DataType, bitfield_names, bitfield_sizes):
@@ -414,19 +793,36 @@ class Int8String(Codec):
         idx = self.value_map[value]
         self._encode(stream, idx)
 
+    def encode_array(self, values, byteorder="little"):
+        positions = pd.Index(list(self.value_map)).get_indexer(np.asarray(values, dtype=object))
+        if np.any(positions < 0):
+            raise KeyError("Value not found in the string codec's dictionary")
+        return self._write_array(np.fromiter(self.value_map.values(), dtype=np.int64)[positions], byteorder)
+
     def decode(self, stream):
         idx = self._decode(stream)
         return self.values[idx]
 
+    def _decode_array(self, buffer, offsets, byteorder, dtype=None):
+        values = np.empty(len(self.values), dtype=object)
+        values[:] = self.values
+        return values[self._read_array(buffer, offsets, byteorder)], None
+
+    def _decode_codes(self, buffer, offsets, byteorder):
+        # The encoded values are already indexes into the dictionary of strings
+        return self._read_array(buffer, offsets, byteorder).astype(np.intp), self.values
+
     @property
     def numChanges(self):
         if self._numChanges is None:
-            assert self._data is not None
-            self._numChanges = (self._data != self._data.shift()).sum() - 1
+            assert self._statistics is not None
+            self._numChanges = self._statistics.num_changes()
         return self._numChanges
 
 
 class Int16String(Int8String):
+    encoded_dtype = "u2"
+
     @staticmethod
     def _encode(stream, value):
         stream.encodeUInt16(value)
@@ -438,17 +834,19 @@ class Int16String(Int8String):
 
 class LongConstantString(Codec):
     value: str
+    constant = True
 
     def __init__(self, *args, value, **kwargs):
         self.value = value
         super().__init__(*args, **kwargs)
 
     @classmethod
-    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields):
-        assert not data.hasnans
+    def from_dataframe(cls, column_name: str, data: pd.Series, data_type: DataType, bitfields, statistics=None):
+        statistics = statistics or ColumnStatistics(data)
+        assert not statistics.has_missing
         assert data_type == DataType.STRING
         assert not bitfields
-        assert data.nunique() == 1
+        assert statistics.cardinality == 1
         return cls(column_name, 0, 0, data_type, value=data.iloc[0])
 
     @classmethod
@@ -473,15 +871,23 @@ class LongConstantString(Codec):
     def encode(self, stream, value):
         pass
 
+    def encode_array(self, values, byteorder="little"):
+        return b""
+
     def decode(self, stream):
         return self.value
 
+    def _decode_array(self, buffer, offsets, byteorder, dtype=None):
+        return np.full(len(offsets), self.value, dtype=object), None
+
     @property
     def numChanges(self):
         return 0
 
 
 def select_codec(column_name: str, data: pd.Series, data_type, bitfields):
+    statistics = ColumnStatistics(data)
+
     # If data types are not specified, determine them from the pandas Series
 
     if data_type is None:
@@ -490,7 +896,7 @@ def select_codec(column_name: str, data: pd.Series, data_type, bitfields):
 
         elif data.dtype in ("float64", "float32"):
             # Detect integers encoded as float32 or 64 (NaNs also can't be present)
-            if not data.isnull().all() and all(pd.isnull(v) or float(v).is_integer() for v in data):
+            if not statistics.all_missing and statistics.is_integral:
                 data_type = DataType.INTEGER
             elif data.dtype == "float64":
                 data_type = DataType.DOUBLE
@@ -498,7 +904,7 @@ def select_codec(column_name: str, data: pd.Series, data_type, bitfields):
                 data_type = DataType.REAL
 
         elif data.dtype == "object" or pd.api.types.is_string_dtype(data):
-            if not data.isnull().all() and all(s is None or isinstance(s, str) for s in data):
+            if not statistics.all_missing and statistics.is_string:
                 data_type = DataType.STRING
 
     if data_type is None:
@@ -507,13 +913,14 @@ def select_codec(column_name: str, data: pd.Series, data_type, bitfields):
     # And now the logic for selecting the codec
 
     codec_class = None
+    cardinality = statistics.cardinality
+    has_missing = statistics.has_missing
 
     if data_type in (DataType.INTEGER, DataType.BITFIELD):
-        range = data.max() - data.min()
-        has_missing = data.hasnans
+        range = statistics.max - statistics.min
 
-        if data.nunique() == 1:
-            if data.hasnans:
+        if cardinality == 1:
+            if has_missing:
                 codec_class = ConstantOrMissing
             else:
                 codec_class = Constant
@@ -524,8 +931,8 @@ def select_codec(column_name: str, data: pd.Series, data_type, bitfields):
                     break
 
     elif data_type == DataType.DOUBLE:
-        if data.nunique() == 1:
-            if data.hasnans:
+        if cardinality == 1:
+            if has_missing:
                 codec_class = RealConstantOrMissing
             else:
                 codec_class = Constant
@@ -533,31 +940,31 @@ def select_codec(column_name: str, data: pd.Series, data_type, bitfields):
             codec_class = LongReal
 
     elif data_type == DataType.REAL:
-        if data.nunique() == 1:
-            if data.hasnans:
+        if cardinality == 1:
+            if has_missing:
                 codec_class = RealConstantOrMissing
             else:
                 codec_class = Constant
-        elif INTERNAL_REAL_MISSING[1] in data.values:
-            if INTERNAL_REAL_MISSING[0] in data.values:
+        elif INTERNAL_REAL_MISSING[1] in statistics.values:
+            if INTERNAL_REAL_MISSING[0] in statistics.values:
                 raise ValueError("Cannot encode a float data series with both internal missing values")
             codec_class = ShortReal
         else:
             codec_class = ShortReal2
 
     elif data_type == DataType.STRING:
-        if data.nunique() == 1 and not data.hasnans and len(data.iloc[0]) <= 8:
+        if cardinality == 1 and not has_missing and len(data.iloc[0]) <= 8:
             codec_class = ConstantString
-        elif data.nunique() == 1 and not data.hasnans and "ODC_ENABLE_WRITING_LONG_STRING_CODEC" in os.environ:
+        elif cardinality == 1 and not has_missing and "ODC_ENABLE_WRITING_LONG_STRING_CODEC" in os.environ:
             codec_class = LongConstantString
-        elif data.nunique() <= 256:
+        elif cardinality <= 256:
             codec_class = Int8String
         else:
-            assert data.nunique() <= 32767
+            assert cardinality <= 32767
             codec_class = Int16String
 
     if codec_class is not None:
-        return codec_class.from_dataframe(column_name, data, data_type, bitfields)
+        return codec_class.from_dataframe(column_name, data, data_type, bitfields, statistics)
 
     print(data)
     print(data_type)
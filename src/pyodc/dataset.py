@@ -0,0 +1,260 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas
+
+from .constants import BITFIELD, DOUBLE, INTEGER, REAL, STRING
+from .parallel import ordered_map
+from .reader import Reader, _read_odb_oneshot, read_odb
+
+# Numeric column types that can be combined across files, in order of increasing precision
+_NUMERIC_PROMOTION = [BITFIELD, INTEGER, REAL, DOUBLE]
+
+
+def partition_keys(path):
+    """
+    Extract the partition keys from the directories of a path laid out as ``key=value`` components
+
+    Parameters:
+        path(str): The path of a file in the dataset
+
+    Returns:
+        dict: The value of each partition key, as a string
+    """
+    keys = {}
+    for component in os.path.normpath(os.path.dirname(path)).split(os.sep):
+        key, sep, value = component.partition("=")
+        if sep and key:
+            keys[key] = value
+    return keys
+
+
+def _accepts(value, condition):
+    if callable(condition):
+        return condition(value)
+    if isinstance(condition, (list, tuple, set, frozenset)):
+        return value in {str(c) for c in condition}
+    return value == str(condition)
+
+
+def _passes(keys, filter, complete):
+    """
+    Test partition keys against a filter. If the keys are not complete (i.e. only the keys of a parent
+    directory are known) then filtered keys that have not yet been seen do not cause the test to fail.
+    """
+    for key, condition in filter.items():
+        if key in keys:
+            if not _accepts(keys[key], condition):
+                return False
+        elif complete:
+            return False
+    return True
+
+
+def _walk(top, filter):
+    """
+    Find the ODB-2 files beneath a directory, without descending into partitions that fail the filter
+    """
+    found = []
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames[:] = sorted(
+            d for d in dirnames if _passes(partition_keys(os.path.join(dirpath, d, "")), filter, False)
+        )
+        if _passes(partition_keys(os.path.join(dirpath, "")), filter, True):
+            found.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith(".odb"))
+    return found
+
+
+def _output_names(column):
+    """
+    The names under which a column, and any bitfields it contains, can be requested from a frame
+    """
+    name, _, table = column.name.partition("@")
+    suffix = "@" + table if table else ""
+    names = {column.name, name}
+    for bitfield in column.bitfields or ():
+        names.update((f"{name}.{bitfield.name}{suffix}", f"{name}.{bitfield.name}"))
+    return names
+
+
+def _combine_types(name, a, b):
+    if a == b:
+        return a
+    if a in _NUMERIC_PROMOTION and b in _NUMERIC_PROMOTION:
+        return max(a, b, key=_NUMERIC_PROMOTION.index)
+    raise ValueError(f"Column '{name}' has incompatible types {a.name} and {b.name} in different files")
+
+
+class _FileSummary:
+    """
+    The columns and size of a single file in a dataset, as found by scanning its frame headers
+    """
+
+    def __init__(self, path, frames):
+        self.path = path
+        self.nrows = 0
+        self.columns = {}
+        self.names = set()
+        for frame in frames:
+            self.nrows += frame.nrows
+            for column in frame.columns:
+                dtype = self.columns.get(column.name, column.dtype)
+                self.columns[column.name] = _combine_types(column.name, dtype, column.dtype)
+                self.names.update(_output_names(column))
+
+
+def _decode_file(path, columns):
+    return read_odb(path, columns=columns, single=True)
+
+
+class Dataset:
+    """
+    A collection of ODB-2 files that are decoded together as a single table. Directories may be partitioned
+    by naming them ``key=value``, and partitions can be skipped without reading the files they contain.
+
+    Parameters:
+        source(str|list): A directory, file, or glob pattern, or a list of these. Directories are searched
+                          recursively for files with the ``.odb`` extension
+        filter(dict): Conditions on the partition keys of the files to read. Each value is either a value for the
+                      key, a collection of acceptable values, or a function that takes the value and returns
+                      ``True`` if the partition is to be read. Partition values are always strings
+        workers(int): The number of files to scan or decode concurrently. Defaults to the number of CPUs
+
+    Attributes:
+        files(list): The paths of the files in the dataset that pass the filter
+    """
+
+    _reader = Reader
+    _decode_file = staticmethod(_decode_file)
+    _executor = ProcessPoolExecutor
+
+    def __init__(self, source, filter=None, workers=None):
+        self._filter = filter or {}
+        self._workers = workers or os.cpu_count() or 1
+        self._summaries = None
+
+        sources = [source] if isinstance(source, (str, os.PathLike)) else list(source)
+        self.files = []
+        for src in map(os.fspath, sources):
+            if os.path.isdir(src):
+                self.files.extend(_walk(src, self._filter))
+            else:
+                paths = sorted(glob.glob(src, recursive=True)) if glob.has_magic(src) else [src]
+                self.files.extend(p for p in paths if _passes(partition_keys(p), self._filter, True))
+
+    def _scan(self, path):
+        return _FileSummary(path, self._reader(path).frames)
+
+    @property
+    def _files(self):
+        # Frame headers are read concurrently. This is dominated by I/O, so threads are sufficient.
+        if self._summaries is None:
+            with ThreadPoolExecutor(self._workers) as executor:
+                self._summaries = list(executor.map(self._scan, self.files))
+        return self._summaries
+
+    @property
+    def schema(self):
+        """
+        The columns present in any of the files, and their types. Numeric columns whose type differs
+        between files take the most precise of the types.
+
+        Returns:
+            dict: The :class:`.DataType` of each column, by name
+        """
+        schema = {}
+        for summary in self._files:
+            for name, dtype in summary.columns.items():
+                schema[name] = _combine_types(name, schema.get(name, dtype), dtype)
+        return schema
+
+    @property
+    def nrows(self):
+        """
+        The total number of rows in the files of the dataset
+        """
+        return sum(summary.nrows for summary in self._files)
+
+    def _conform(self, df, summary, names, schema):
+        """
+        Give a dataframe decoded from a file the columns of the whole dataset, filling in those that the file
+        does not contain as missing
+        """
+        if len(df.columns) == 0:
+            df = pandas.DataFrame(index=pandas.RangeIndex(summary.nrows))
+        df = df.reindex(columns=names)
+        for name in names:
+            if name not in summary.names and schema.get(name) == STRING:
+                df[name] = pandas.Series([None] * len(df), index=df.index, dtype=object)
+        return df
+
+    def iter_dataframes(self, columns=None):
+        """
+        Decode the files in the dataset concurrently, yielding a dataframe per file in order. Every dataframe has
+        the same columns, with missing values where a file does not contain a column.
+
+        Parameters:
+            columns(list|tuple): The columns to decode. If ``None``, all of the columns in the schema are decoded
+
+        Returns:
+            iterator(DataFrame)
+        """
+        schema = self.schema
+        names = list(schema) if columns is None else list(columns)
+
+        tasks = []
+        for summary in self._files:
+            file_columns = [name for name in names if name in summary.names]
+            if columns is None and len(file_columns) == len(names):
+                file_columns = None
+            tasks.append((summary.path, file_columns))
+
+        # Files that contain none of the requested columns are not read at all
+        pending = [task for task in tasks if task[1] != []]
+
+        if self._workers == 1:
+            results = (self._decode_file(*task) for task in pending)
+            yield from self._assemble(results, tasks, names, schema)
+        else:
+            with self._executor(self._workers) as executor:
+                results = ordered_map(executor, self._decode_file, pending, 2 * self._workers)
+                yield from self._assemble(results, tasks, names, schema)
+
+    def _assemble(self, results, tasks, names, schema):
+        for summary, (_, file_columns) in zip(self._files, tasks):
+            df = pandas.DataFrame() if file_columns == [] else next(results)
+            yield self._conform(df, summary, names, schema)
+
+    def __iter__(self):
+        return self.iter_dataframes()
+
+    def to_pandas(self, columns=None):
+        """
+        Decode the files in the dataset concurrently into a single dataframe
+
+        Parameters:
+            columns(list|tuple): The columns to decode. If ``None``, all of the columns in the schema are decoded
+
+        Returns:
+            DataFrame
+        """
+        dataframes = list(self.iter_dataframes(columns))
+        if not dataframes:
+            return pandas.DataFrame(columns=list(self.schema) if columns is None else list(columns))
+        return _read_odb_oneshot(dataframes)
+
+
+def dataset(source, filter=None, workers=None):
+    """
+    Open a collection of ODB-2 files as a single dataset (see :class:`.Dataset`)
+
+    Parameters:
+        source(str|list): A directory, file, or glob pattern, or a list of these
+        filter(dict): Conditions on the partition keys of the files to read
+        workers(int): The number of files to scan or decode concurrently
+
+    Returns:
+        Dataset
+    """
+    return Dataset(source, filter=filter, workers=workers)
@@ -1,11 +1,21 @@
 import hashlib
 import io
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, chain
 
 import numpy as np
 import pandas as pd
 
 from .codec import select_codec
-from .constants import ENDIAN_MARKER, FORMAT_VERSION_NUMBER_MAJOR, FORMAT_VERSION_NUMBER_MINOR, MAGIC, NEW_HEADER
+from .constants import (
+    ENDIAN_MARKER,
+    FORMAT_VERSION_NUMBER_MAJOR,
+    FORMAT_VERSION_NUMBER_MINOR,
+    MAGIC,
+    NEW_HEADER,
+    DataType,
+)
+from .parallel import ordered_map
 from .stream import BigEndianStream, LittleEndianStream
 
 
@@ -17,19 +27,50 @@ def encode_odb(
     bigendian: bool = False,
     properties: dict = None,
     bitfields: dict = None,
+    workers: int = None,
+    split: str = None,
+    column_order=None,
+    sort_within_frame=None,
+    target_frame_bytes: int = None,
 ):
     """
     Encode a pandas dataframe into an ODB-2 stream
 
     Parameters:
-        dataframe(DataFrame): A pandas dataframe to encode
+        dataframe(DataFrame|iterable): A pandas dataframe to encode, or an iterable of dataframes, ``pyarrow``
+                                       record batches, or dicts of column-name : array pairs. The rows are
+                                       regrouped into frames as they are read
         target(str|file): A file-like object to write the encoded data to
         types(dict): A dictionary of (optional) column-name : constant :class:`.DataType` pairs, or ``None``
         bigendian(bool): Encode in big-endian byte order if ``True``
         properties(dict): Encode a dictionary of supplied properties
         bitfields(dict): A dictionary containing entries for BITFIELD columns. The values are either bitfield names, or
                          tuple pairs of bitfield name and bitfield size
+        workers(int): Encode frames in parallel using a pool of this many processes. The frames are written in order,
+                      and the output is identical to that of encoding them serially
+        split(str): How a dataframe is split into frames. ``"slice"`` (the default) takes positional views of the
+                    rows without copying them, and ``"groupby"`` copies each frame's rows out of the dataframe with
+                    ``groupby``. The output is the same either way. Cannot be combined with ``target_frame_bytes``,
+                    which slices the dataframe by size
+        column_order(list|str): The order in which to encode the columns. If ``None``, the columns are ordered
+                                by the number of changes in their values in the first frame. If ``"optimise"``, the
+                                order that minimises the encoded size is searched for (see
+                                :func:`optimise_column_order`)
+        sort_within_frame(list|str): Reorder the rows within each frame, sorting them by these columns, so that
+                                     runs of rows repeat the values of the leading columns. If ``"auto"``, rows are
+                                     sorted by the columns with few distinct values in each frame, fewest first
+        target_frame_bytes(int): Size frames to encode to about this many bytes each, rather than a fixed number of
+                                 rows. The number of rows in each frame is estimated from the codecs chosen for, and
+                                 the repetition in, the rows at the start of the frame. Cannot be combined with
+                                 ``split``
     """
+    if split not in (None, "slice", "groupby"):
+        raise ValueError("Unknown split method '{}'".format(split))
+    if split is not None and target_frame_bytes is not None:
+        raise ValueError("A split method cannot be combined with target_frame_bytes")
+    if isinstance(sort_within_frame, str) and sort_within_frame != "auto":
+        raise ValueError("Unknown row ordering '{}'".format(sort_within_frame))
+
     if isinstance(target, str):
         with open(target, "wb") as real_target:
             return encode_odb(
@@ -40,12 +81,71 @@ def encode_odb(
                 bigendian=bigendian,
                 properties=properties,
                 bitfields=bitfields,
+                workers=workers,
+                split=split,
+                column_order=column_order,
+                sort_within_frame=sort_within_frame,
+                target_frame_bytes=target_frame_bytes,
             )
 
-    column_order = None
-
     # Split the dataframe into chunks of appropriate size
-    for i, sub_df in dataframe.groupby(np.arange(len(dataframe)) // rows_per_frame):
+    if target_frame_bytes is not None:
+        rows_per_frame = frame_rows_for_size(target_frame_bytes, types, bitfields)
+        if isinstance(dataframe, pd.DataFrame):
+            chunks = _slices_by_size(dataframe, rows_per_frame)
+        else:
+            chunks = rechunk_dataframes(dataframe, rows_per_frame)
+    elif isinstance(dataframe, pd.DataFrame) and split != "groupby":
+        chunks = (dataframe.iloc[i : i + rows_per_frame] for i in range(0, len(dataframe), rows_per_frame))
+    elif isinstance(dataframe, pd.DataFrame):
+        chunks = (sub_df for _, sub_df in dataframe.groupby(np.arange(len(dataframe)) // rows_per_frame))
+    else:
+        chunks = rechunk_dataframes(dataframe, rows_per_frame)
+
+    if sort_within_frame is not None:
+        chunks = (sort_frame(sub_df, sort_within_frame) for sub_df in chunks)
+
+    if isinstance(column_order, str):
+        if column_order != "optimise":
+            raise ValueError("Unknown column order '{}'".format(column_order))
+        # An iterable of batches can only be read once, so the order is optimised for the first frame
+        if not isinstance(dataframe, pd.DataFrame):
+            first = next(chunks, None)
+            if first is None:
+                return
+            dataframe = first
+            chunks = chain([first], chunks)
+        if callable(rows_per_frame):
+            rows_per_frame = rows_per_frame(dataframe)
+        column_order = optimise_column_order(
+            dataframe, rows_per_frame, types=types, bitfields=bitfields, sort_within_frame=sort_within_frame
+        ).column_order
+
+    if workers is not None and workers > 1:
+        # The column order is determined by the first frame, and imposed on the others, so the first frame
+        # is encoded before the rest are distributed to the workers.
+        first = next(chunks, None)
+        if first is None:
+            return
+        column_order = encode_single_dataframe(
+            first,
+            target,
+            types=types,
+            column_order=column_order,
+            bigendian=bigendian,
+            properties=(properties or {}),
+            bitfields=bitfields,
+        )
+
+        with ProcessPoolExecutor(workers) as executor:
+            tasks = ((sub_df, types, column_order, bigendian, (properties or {}), bitfields) for sub_df in chunks)
+            for encoded in ordered_map(executor, _encode_frame_task, tasks, 2 * workers):
+                target.write(encoded)
+        return
+
+    # Each frame is assembled in the same scratch buffer, which only grows if a frame is larger than those before
+    buffer = FrameBuffer()
+    for sub_df in chunks:
         column_order = encode_single_dataframe(
             sub_df,
             target,
@@ -54,9 +154,436 @@ def encode_odb(
             bigendian=bigendian,
             properties=(properties or {}),
             bitfields=bitfields,
+            buffer=buffer,
         )
 
 
+def as_dataframe(data):
+    """
+    Convert a batch of rows to a pandas dataframe. This may be a dataframe, a dict of column-name : array pairs,
+    or an object that provides ``to_pandas()``, such as a ``pyarrow.RecordBatch``.
+
+    :meta private:
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, dict):
+        return pd.DataFrame(data)
+    if hasattr(data, "to_pandas"):
+        return data.to_pandas()
+    raise TypeError("Cannot encode data of type {}".format(type(data).__name__))
+
+
+def rechunk_dataframes(batches, rows_per_frame):
+    """
+    Regroup batches of rows of any size into dataframes of ``rows_per_frame`` rows (except the last, which
+    may be shorter). At most one frame's worth of rows is held back at a time.
+
+    Parameters:
+        batches(iterable): Dataframes, or other batches of rows accepted by :func:`as_dataframe`. A single
+                           dataframe, dict or record batch is also accepted
+        rows_per_frame(int|callable): The number of rows in each dataframe, or a function that gives the number
+                                      of rows for the frame starting with the rows it is passed
+
+    :meta private:
+    """
+    if isinstance(batches, (pd.DataFrame, dict)) or hasattr(batches, "to_pandas"):
+        batches = [batches]
+
+    frame_rows = rows_per_frame if callable(rows_per_frame) else (lambda df: rows_per_frame)
+
+    pending = []
+    npending = 0
+    nrows = None
+    for batch in map(as_dataframe, batches):
+        if len(batch) == 0:
+            continue
+        pending.append(batch)
+        npending += len(batch)
+        if nrows is None:
+            nrows = frame_rows(pending[0])
+
+        while nrows is not None and npending >= nrows:
+            buffered = pending[0] if len(pending) == 1 else pd.concat(pending, ignore_index=True, sort=False)
+            yield buffered.iloc[:nrows]
+            pending = [buffered.iloc[nrows:]] if len(buffered) > nrows else []
+            npending -= nrows
+            nrows = frame_rows(pending[0]) if pending else None
+
+    if pending:
+        yield pending[0] if len(pending) == 1 else pd.concat(pending, ignore_index=True, sort=False)
+
+
+# The number of rows examined to estimate the encoded size of the rows in a frame
+SIZE_ESTIMATE_ROWS = 1000
+
+
+def estimate_row_size(dataframe: pd.DataFrame, types: dict = None, bitfields: dict = None):
+    """
+    Estimate the average number of bytes needed to encode each row of a dataframe, from the widths of the codecs
+    that would be selected, and the columns that each row would encode.
+
+    Parameters:
+        dataframe(DataFrame): The rows to examine
+        types(dict): A dictionary of (optional) column-name : constant :class:`.DataType` pairs, or ``None``
+        bitfields(dict): A dictionary containing entries for BITFIELD columns
+
+    Returns:
+        float: The average encoded size of a row in bytes
+    """
+    nrows = len(dataframe)
+    codecs = _select_codecs(dataframe, types, None, bitfields)
+    column_indexes = {column_name: i for i, column_name in enumerate(dataframe.columns)}
+    columns = [dataframe.iloc[:, column_indexes[codec.column_name]].to_numpy() for codec in codecs]
+
+    return 2 + _tail_sizes(codecs)[_row_markers(columns, nrows)].sum() / nrows
+
+
+def frame_rows_for_size(target_frame_bytes, types: dict = None, bitfields: dict = None):
+    """
+    Make a function that gives the number of rows, starting with those in a dataframe, that are expected to
+    encode to about ``target_frame_bytes`` bytes.
+
+    :meta private:
+    """
+
+    def frame_rows(dataframe):
+        row_size = estimate_row_size(dataframe.iloc[:SIZE_ESTIMATE_ROWS], types, bitfields)
+        return max(1, int(target_frame_bytes // row_size))
+
+    return frame_rows
+
+
+def _slices_by_size(dataframe, frame_rows):
+    start = 0
+    while start < len(dataframe):
+        nrows = frame_rows(dataframe.iloc[start:])
+        yield dataframe.iloc[start : start + nrows]
+        start += nrows
+
+
+def sort_frame(dataframe, sort_within_frame):
+    """
+    Reorder the rows of a frame by the values of some of its columns. Rows with equal values remain in their
+    original order.
+
+    Parameters:
+        dataframe(DataFrame): The rows of the frame
+        sort_within_frame(list|str): The columns to sort by, or ``"auto"`` to sort by the columns with at most half
+                                     as many distinct values as there are rows, fewest distinct values first
+
+    :meta private:
+    """
+    if isinstance(sort_within_frame, str):
+        if sort_within_frame != "auto":
+            raise ValueError("Unknown row ordering '{}'".format(sort_within_frame))
+        cardinality = dataframe.nunique().sort_values(kind="stable")
+        columns = [name for name, count in cardinality.items() if 1 < count <= len(dataframe) // 2]
+    else:
+        columns = list(sort_within_frame)
+
+    if not columns:
+        return dataframe
+    return dataframe.sort_values(columns, kind="stable")
+
+
+class FrameBuffer:
+    """
+    A scratch buffer in which frames are assembled before they are written. It is reused from one frame to the next,
+    so that memory is only allocated when a frame is larger than any before it.
+
+    :meta private:
+    """
+
+    def __init__(self):
+        self._buffer = np.empty(0, dtype=np.uint8)
+
+    def get(self, size):
+        """
+        Returns:
+            ndarray: A (uninitialised) byte array of the given size, valid until the next call
+        """
+        if len(self._buffer) < size:
+            self._buffer = np.empty(size, dtype=np.uint8)
+        return self._buffer[:size]
+
+
+# The scratch buffer used by each worker process when encoding frames in parallel
+_task_buffer = None
+
+
+def _encode_frame_task(dataframe, types, column_order, bigendian, properties, bitfields):
+    """
+    Encode a single frame in a worker process, returning the encoded bytes
+    """
+    global _task_buffer
+    if _task_buffer is None:
+        _task_buffer = FrameBuffer()
+
+    codecs = _select_codecs(dataframe, types, column_order, bitfields)
+    return bytes(_encodeFrame(dataframe, codecs, bigendian, properties, _task_buffer))
+
+
+class ColumnOrdering:
+    """
+    The result of optimising the order in which columns are encoded (see :func:`optimise_column_order`). The sizes
+    are those of the data sections of the frames examined.
+
+    Attributes:
+        column_order(list): The optimised column order
+        default_order(list): The order that is used by default, by the number of changes in the first frame
+        encoded_size(int): The encoded size of the data with the optimised column order
+        default_size(int): The encoded size of the data with the default column order
+    """
+
+    def __init__(self, column_order, default_order, encoded_size, default_size):
+        self.column_order = column_order
+        self.default_order = default_order
+        self.encoded_size = encoded_size
+        self.default_size = default_size
+
+    @property
+    def saving(self):
+        """The number of bytes saved by the optimised column order"""
+        return self.default_size - self.encoded_size
+
+    def __repr__(self):
+        return "ColumnOrdering(column_order={}, encoded_size={}, default_size={}, saving={:.1%})".format(
+            self.column_order, self.encoded_size, self.default_size, self.saving / max(self.default_size, 1)
+        )
+
+
+class _OrderCost:
+    """
+    The size of the encoded data for an ordering of the columns. A row encodes each column from the first that has
+    changed onwards, so the n'th column is encoded in every row in which any of the first n columns has changed.
+    """
+
+    def __init__(self, changed, widths):
+        self.changed = changed
+        self.widths = widths
+        self.nrows = changed.shape[1]
+
+    def term(self, order, k, union):
+        # The last column is encoded in every row, even those that repeat the previous row entirely
+        count = self.nrows if k == len(order) - 1 else np.count_nonzero(union)
+        return self.widths[order[k]] * count
+
+    def unions(self, order):
+        unions = np.logical_or.accumulate(self.changed[order], axis=0)
+        return list(unions)
+
+    def total(self, order):
+        unions = self.unions(order)
+        return 2 * self.nrows + sum(self.term(order, k, union) for k, union in enumerate(unions))
+
+
+def _greedy_order(cost):
+    """
+    Build a column order one column at a time, choosing the column that is encoded in the fewest rows in each
+    position (and, amongst those, the widest), then improve it by swapping neighbouring columns
+    """
+    remaining = list(range(len(cost.widths)))
+    order = []
+    union = np.zeros(cost.nrows, dtype=bool)
+    while remaining:
+        counts = [np.count_nonzero(union | cost.changed[c]) for c in remaining]
+        best = min(range(len(remaining)), key=lambda i: (counts[i], -cost.widths[remaining[i]]))
+        order.append(remaining.pop(best))
+        union |= cost.changed[order[-1]]
+
+    unions = cost.unions(order)
+    improved = True
+    while improved:
+        improved = False
+        for k in range(len(order) - 1):
+            swapped = order[:k] + [order[k + 1], order[k]] + order[k + 2 :]
+            union = cost.changed[swapped[k]] if k == 0 else unions[k - 1] | cost.changed[swapped[k]]
+            before = cost.term(order, k, unions[k]) + cost.term(order, k + 1, unions[k + 1])
+            after = cost.term(swapped, k, union) + cost.term(swapped, k + 1, unions[k + 1])
+            if after < before:
+                order, unions[k], improved = swapped, union, True
+
+    return order
+
+
+def optimise_column_order(
+    dataframe: pd.DataFrame,
+    rows_per_frame=10000,
+    types: dict = None,
+    bitfields: dict = None,
+    sample_frames=None,
+    sort_within_frame=None,
+):
+    """
+    Search for the order of the columns that minimises the encoded size of a dataframe. Each row encodes the
+    columns from the first one whose value has changed, so it pays to place columns that change rarely, and
+    wide columns that change together with them, first.
+
+    Parameters:
+        dataframe(DataFrame): A pandas dataframe to be encoded
+        rows_per_frame(int): The number of rows that will be encoded in each frame
+        types(dict): A dictionary of (optional) column-name : constant :class:`.DataType` pairs, or ``None``
+        bitfields(dict): A dictionary containing entries for BITFIELD columns
+        sample_frames(int): Only examine this many frames, evenly spaced through the dataframe. If ``None``, all
+                            the frames are examined
+        sort_within_frame(list|str): How the rows will be reordered within each frame (see :func:`encode_odb`)
+
+    Returns:
+        ColumnOrdering: The optimised order, and the saving over the default order
+    """
+    nframes = -(-len(dataframe) // rows_per_frame)
+    if nframes == 0:
+        raise ValueError("Cannot optimise the column order of an empty dataframe")
+
+    frame_indexes = range(nframes)
+    if sample_frames is not None and sample_frames < nframes:
+        frame_indexes = np.unique(np.linspace(0, nframes - 1, sample_frames).round().astype(int))
+    frames = [dataframe.iloc[i * rows_per_frame : (i + 1) * rows_per_frame] for i in frame_indexes]
+    if sort_within_frame is not None:
+        frames = [sort_frame(frame, sort_within_frame) for frame in frames]
+    sample = frames[0] if len(frames) == 1 else pd.concat(frames)
+
+    names = list(dataframe.columns)
+    codecs = {c.column_name: c for c in _select_codecs(sample, types, None, bitfields)}
+    widths = np.array([codecs[name].encoded_size for name in names])
+
+    # Each frame starts afresh, encoding every column in its first row
+    changed = np.concatenate(
+        [np.array([_changed_rows(frame.iloc[:, i].to_numpy()) for i in range(len(names))]) for frame in frames],
+        axis=1,
+    )
+    cost = _OrderCost(changed, widths)
+
+    indexes = {name: i for i, name in enumerate(names)}
+    default = [indexes[c.column_name] for c in _select_codecs(frames[0], types, None, bitfields)]
+    default_size = cost.total(default)
+
+    order = _greedy_order(cost)
+    encoded_size = cost.total(order)
+    if encoded_size >= default_size:
+        order, encoded_size = default, default_size
+
+    return ColumnOrdering([names[i] for i in order], [names[i] for i in default], int(encoded_size), int(default_size))
+
+
+class Writer:
+    """
+    Encode dataframes into an ODB-2 stream incrementally. Rows are buffered until there are enough to fill a
+    frame, so that only about a frame's worth of data is held in memory at once.
+
+    The columns are encoded in the order, and with the types, chosen for the first frame, so that all of the
+    frames have the same structure. Columns that are not given a type are typed according to the data in the
+    first frame, except that floating point columns are always encoded as floating point.
+
+    Parameters:
+        target(str|file): A file-like object to write the encoded data to
+        rows_per_frame(int): The number of rows to encode in each frame. Only the last frame may be shorter
+        types(dict): A dictionary of (optional) column-name : constant :class:`.DataType` pairs, or ``None``
+        bigendian(bool): Encode in big-endian byte order if ``True``
+        properties(dict): Encode a dictionary of supplied properties
+        bitfields(dict): A dictionary containing entries for BITFIELD columns. The values are either bitfield names, or
+                         tuple pairs of bitfield name and bitfield size
+    """
+
+    def __init__(
+        self,
+        target,
+        rows_per_frame=10000,
+        types: dict = None,
+        bigendian: bool = False,
+        properties: dict = None,
+        bitfields: dict = None,
+    ):
+        if isinstance(target, str):
+            self._target = open(target, "wb")
+            self._owns_target = True
+        else:
+            self._target = target
+            self._owns_target = False
+
+        self.rows_per_frame = rows_per_frame
+        self._types = dict(types or {})
+        self._bigendian = bigendian
+        self._properties = properties or {}
+        self._bitfields = bitfields
+        self._column_order = None
+        self._buffer = FrameBuffer()
+
+        self._pending = []
+        self._pending_rows = 0
+
+    def append(self, dataframe: pd.DataFrame):
+        """
+        Add rows to the stream. Any complete frames are encoded and written immediately.
+
+        Parameters:
+            dataframe(DataFrame): The rows to add. A dict of column-name : array pairs, or a ``pyarrow``
+                                  record batch, is also accepted
+        """
+        if self._target is None:
+            raise ValueError("Cannot append to a closed Writer")
+        dataframe = as_dataframe(dataframe)
+        if len(dataframe) == 0:
+            return
+
+        self._pending.append(dataframe)
+        self._pending_rows += len(dataframe)
+        if self._pending_rows < self.rows_per_frame:
+            return
+
+        buffered = self._take_pending()
+        nframes = len(buffered) // self.rows_per_frame
+        for i in range(nframes):
+            self._write_frame(buffered.iloc[i * self.rows_per_frame : (i + 1) * self.rows_per_frame])
+
+        remainder = buffered.iloc[nframes * self.rows_per_frame :]
+        if len(remainder) > 0:
+            self._pending = [remainder]
+            self._pending_rows = len(remainder)
+
+    def close(self):
+        """
+        Encode any remaining rows as a final frame, and close the target if it was opened by the Writer
+        """
+        if self._target is None:
+            return
+        if self._pending_rows > 0:
+            self._write_frame(self._take_pending())
+        if self._owns_target:
+            self._target.close()
+        self._target = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _take_pending(self):
+        if len(self._pending) == 1:
+            buffered = self._pending[0]
+        else:
+            buffered = pd.concat(self._pending, ignore_index=True, sort=False)
+        self._pending = []
+        self._pending_rows = 0
+        return buffered
+
+    def _write_frame(self, dataframe):
+        if self._column_order is None:
+            # Floating point columns that happen to be whole in the first frame may not be in later ones
+            for name, data in dataframe.items():
+                if name not in self._types and data.dtype in ("float32", "float64"):
+                    self._types[name] = DataType.REAL if data.dtype == "float32" else DataType.DOUBLE
+
+        codecs = _select_codecs(dataframe, self._types, self._column_order, self._bitfields)
+        if self._column_order is None:
+            self._column_order = [c.column_name for c in codecs]
+            self._types.update((c.column_name, c.type) for c in codecs if c.column_name not in self._types)
+        frame = _encodeFrame(dataframe, codecs, self._bigendian, self._properties, self._buffer)
+        _write_frame_data(self._target, frame)
+
+
 def encode_single_dataframe(
     dataframe: pd.DataFrame,
     target,
@@ -65,6 +592,7 @@ def encode_single_dataframe(
     bigendian: bool = False,
     properties: dict = None,
     bitfields: dict = None,
+    buffer: FrameBuffer = None,
 ):
     """
     Encode a single dataframe into an ODB-2 stream
@@ -79,6 +607,7 @@ def encode_single_dataframe(
         properties(dict): Encode a dictionary of supplied properties
         bitfields(dict): A dictionary containing entries for BITFIELD columns. The values are either bitfield names, or
                          tuple pairs of bitfield name and bitfield size
+        buffer(FrameBuffer): A scratch buffer to assemble the frame in, reused between frames
 
     Returns:
         list: The column order used for encoding as a list of column names
@@ -86,8 +615,27 @@ def encode_single_dataframe(
     :meta private:
     """
 
-    stream_class = BigEndianStream if bigendian else LittleEndianStream
+    codecs = _select_codecs(dataframe, types, column_order, bitfields)
+    _write_frame_data(target, _encodeFrame(dataframe, codecs, bigendian, properties, buffer))
+    return [c.column_name for c in codecs]
+
+
+def _write_frame_data(target, frame):
+    """
+    Write an encoded frame. The frame may be a view of a reused buffer, so it is only handed on directly to targets
+    known to copy the data written to them, rather than subclasses that may override ``write``. Other targets, which
+    may hold on to it, are given their own copy.
+    """
+    if type(target) in (io.FileIO, io.BufferedWriter, io.BufferedRandom, io.BytesIO):
+        target.write(frame)
+    else:
+        target.write(bytes(frame))
 
+
+def _select_codecs(dataframe, types, column_order, bitfields):
+    """
+    Select the codec for each column of a dataframe, in the order the columns are to be encoded
+    """
     codecs = [
         select_codec(name, data, (types or {}).get(name, None), (bitfields or {}).get(name, None))
         for name, data in dataframe.items()
@@ -103,53 +651,106 @@ def encode_single_dataframe(
         codecs = [codecs[column_name] for column_name in column_order]
     else:
         codecs.sort(key=lambda c: c.numChanges)
-        column_order = [c.column_name for c in codecs]
-        assert len(column_order) == len(set(column_order))
+        assert len(codecs) == len(set(c.column_name for c in codecs))
 
-    data = _encodeData(dataframe, codecs, stream_class)
-    headerPart2 = _encodeHeaderPart2(dataframe, codecs, stream_class, len(data), (properties or {}))
-    headerPart1 = _encodeHeaderPart1(headerPart2, stream_class)
+    return codecs
 
-    target.write(headerPart1)
-    target.write(headerPart2)
-    target.write(data)
 
-    return column_order
+def _encodeFrame(dataframe, codecs, bigendian, properties, buffer=None):
+    """
+    Encode a dataframe as a single frame with the given codecs.
 
+    The size of the data section is known from the row markers and the codec widths before any values are
+    encoded, so the headers and data are assembled in a single buffer that can be written in one call.
 
-def _encodeData(dataframe, codecs, stream_class):
-    """
-    Encode the data into a memory buffer
+    Returns:
+        memoryview: The encoded frame. This is a view of the buffer, so it is only valid until the buffer is reused
     """
-    dataIO = io.BytesIO()
-    stream = stream_class(dataIO)
+    stream_class = BigEndianStream if bigendian else LittleEndianStream
 
     # Encode the column in the order supplied in the indexes list, rather than that
     # inherent in the dataframe.
 
     column_indexes = {column_name: i for i, column_name in enumerate(dataframe.columns)}
-    column_indexes = [column_indexes[codec.column_name] for codec in codecs]
+    columns = [dataframe.iloc[:, column_indexes[codec.column_name]].to_numpy() for codec in codecs]
 
-    # Iterate over rows
+    markers = _row_markers(columns, dataframe.shape[0])
+    tail_sizes = _tail_sizes(codecs)
+    row_sizes = 2 + tail_sizes[markers]
+    data_len = int(row_sizes.sum())
 
-    last_row = None
-    codec_indexes = list(zip(codecs, column_indexes))
+    headerPart2 = _encodeHeaderPart2(dataframe, codecs, stream_class, data_len, (properties or {}))
+    headerPart1 = _encodeHeaderPart1(headerPart2, stream_class)
+    header_len = len(headerPart1) + len(headerPart2)
 
-    for row in dataframe.itertuples(index=False):
-        for i, (codec, index) in enumerate(codec_indexes):
-            if last_row is None or (
-                row[index] != last_row[index] and not (pd.isnull(row[index]) and pd.isnull(last_row[index]))
-            ):
-                break
+    frame = (FrameBuffer() if buffer is None else buffer).get(header_len + data_len)
+    frame[: len(headerPart1)] = np.frombuffer(headerPart1, dtype=np.uint8)
+    frame[len(headerPart1) : header_len] = np.frombuffer(headerPart2, dtype=np.uint8)
+    _encodeData(frame[header_len:], columns, codecs, markers, row_sizes, tail_sizes, stream_class)
 
-        stream.encodeMarker(i)
+    return frame.data
+
+
+def _changed_rows(values):
+    """
+    Flag the rows in which a column's value differs from that in the previous row. Missing values are considered
+    equal to each other, and the first row is always flagged.
+    """
+    isnull = np.asarray(pd.isnull(values))
+    changed = np.ones(len(values), dtype=bool)
+    changed[1:] = np.asarray(values[1:] != values[:-1], dtype=bool) & ~(isnull[1:] & isnull[:-1])
+    return changed
+
+
+def _row_markers(columns, nrows):
+    """
+    Determine the marker of each row, which is the index of the first column (in encoding order) whose value
+    differs from that in the previous row. Missing values are considered equal to each other. The first row
+    encodes every column, and a row that repeats the previous one in full encodes only the last column.
+    """
+    markers = np.full(nrows, len(columns) - 1, dtype=np.int64)
+    undecided = np.ones(nrows, dtype=bool)
+
+    for i, values in enumerate(columns):
+        changed = _changed_rows(values)
+        markers[undecided & changed] = i
+        undecided &= ~changed
+        if not undecided.any():
+            break
+
+    return markers
+
+
+def _tail_sizes(codecs):
+    """
+    The number of bytes used to encode the values of the columns from each column onwards
+    """
+    widths = [codec.encoded_size for codec in codecs]
+    return np.array(list(accumulate(reversed(widths), initial=0))[::-1])
+
+
+def _encodeData(data, columns, codecs, markers, row_sizes, tail_sizes, stream_class):
+    """
+    Encode the data section into a (preallocated) byte array.
+
+    Each row is a (big-endian) marker, followed by the values of the columns from the marker onwards. Each column
+    is encoded in bulk for the rows which include it, and the values scattered into their places in the rows.
+    """
+    byteorder = stream_class.byteOrder
 
-        for codec, index in codec_indexes[i:]:
-            codec.encode(stream, row[index])
+    starts = np.zeros(len(markers), dtype=np.int64)
+    np.cumsum(row_sizes[:-1], out=starts[1:])
 
-        last_row = row
+    data[starts] = markers >> 8
+    data[starts + 1] = markers & 0xFF
 
-    return dataIO.getbuffer()
+    for col, (codec, values) in enumerate(zip(codecs, columns)):
+        width = codec.encoded_size
+        present = markers <= col
+        encoded = codec.encode_array(values[present], byteorder)
+        if width > 0:
+            offsets = starts[present] + 2 + tail_sizes[markers[present]] - tail_sizes[col]
+            data[offsets[:, None] + np.arange(width)] = np.frombuffer(encoded, dtype=np.uint8).reshape(-1, width)
 
 
 def _encodeHeaderPart2(dataframe, codecs, stream_class, data_len, properties):
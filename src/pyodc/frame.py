@@ -10,24 +10,28 @@
 
 from __future__ import absolute_import
 
-from .codec import read_codec
+from .codec import categorical_column, decoded_column, nullable_column, read_codec
 from .constants import (
     BITFIELD,
     ENDIAN_MARKER,
     FORMAT_VERSION_NUMBER_MAJOR,
     FORMAT_VERSION_NUMBER_MINOR,
+    INTEGER,
     MAGIC,
     NEW_HEADER,
+    STRING,
     TYPE_NAMES,
 )
-from .stream import BigEndianStream, LittleEndianStream
+from .stream import BigEndianStream, BufferReader, LittleEndianStream
 
 try:
     from collections.abc import Iterable
 except ImportError:
     from collections import Iterable
 
+import hashlib
 import warnings
+from functools import lru_cache
 from itertools import accumulate, chain
 
 import numpy as np
@@ -38,6 +42,117 @@ class MismatchedFramesError(ValueError):
     pass
 
 
+def _read_exactly(source, n, allow_eof=False):
+    """
+    Read exactly n bytes from a stream such as a pipe or socket, which may return fewer bytes per read
+    """
+    chunks = []
+    remaining = n
+    while remaining > 0:
+        chunk = source.read(remaining)
+        if not chunk:
+            if allow_eof and remaining == n:
+                raise EOFError()
+            raise ValueError("Truncated ODB-2 frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def check_strings(strings):
+    """
+    Validate the ``strings`` argument of the decoding functions
+
+    Parameters:
+        strings(str): How string columns are to be decoded, either ``"object"`` or ``"categorical"``
+    """
+    if strings not in ("object", "categorical"):
+        raise ValueError(f"Unknown strings '{strings}', expected 'object' or 'categorical'")
+
+
+def extract_nullable_bitfield(array, bitfield):
+    """
+    Extract a bitfield from a nullable integer column, as a nullable column with the same missing values
+
+    Parameters:
+        array(IntegerArray): The values of the bitfield column
+        bitfield(ColumnInfo.Bitfield): The bitfield to extract
+    """
+    values = np.right_shift(array.to_numpy(dtype=np.int64, na_value=0), bitfield.offset) & ((1 << bitfield.size) - 1)
+    if bitfield.size == 1:
+        return pd.arrays.BooleanArray(values.astype(bool), array.isna())
+    return pd.arrays.IntegerArray(values, array.isna())
+
+
+def unify_categories(dfs):
+    """
+    Give each categorical column the same categories in all of the dataframes, so that it remains categorical when
+    they are concatenated. The codes are remapped, rather than the values being expanded.
+
+    Returns:
+        list: The dataframes
+    """
+    dfs = list(dfs)
+    names = {name for df in dfs for name, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)}
+    for name in names:
+        columns = [df[name] for df in dfs if name in df.columns]
+        if not all(isinstance(column.dtype, pd.CategoricalDtype) for column in columns):
+            continue
+
+        # Categories are kept in the order they are first seen
+        categories = columns[0].cat.categories
+        for column in columns[1:]:
+            new = column.cat.categories
+            categories = categories.append(new[~new.isin(categories)])
+
+        for df in dfs:
+            if name in df.columns and not df[name].cat.categories.equals(categories):
+                df[name] = df[name].cat.set_categories(categories)
+    return dfs
+
+
+def concat_frames(dfs):
+    """
+    Concatenate the dataframes decoded from a sequence of aggregated frames
+    """
+    dfs = unify_categories(dfs)
+    with warnings.catch_warnings():
+        # pandas 2.1.0 has a FutureWarning for concatenating DataFrames with Null entries
+        # It's not clear there's anything to do except suppress it.
+        # See https://github.com/pandas-dev/pandas/issues/55928
+        warnings.filterwarnings("ignore", category=FutureWarning)
+        return pd.concat(
+            dfs,
+            copy=False,
+            axis=0,
+            ignore_index=True,
+        )
+
+
+def read_frame_data(source):
+    """
+    Read the complete encoded content of the next frame from a forward-only stream, without seeking.
+
+    Parameters:
+        source(file): An object with a ``read()`` method
+
+    Returns:
+        bytes: The frame header and data
+    """
+    # Marker, magic, endian marker, version numbers and the length of the MD5 string
+    head = _read_exactly(source, 21, allow_eof=True)
+
+    byteorder = "little" if int.from_bytes(head[5:9], byteorder="little") == ENDIAN_MARKER else "big"
+    md5_length = int.from_bytes(head[17:21], byteorder=byteorder, signed=True)
+
+    # MD5 string and header length, followed by the remainder of the header, which starts with the data size
+    md5 = _read_exactly(source, md5_length + 4)
+    header = _read_exactly(source, int.from_bytes(md5[-4:], byteorder=byteorder, signed=True))
+    data = _read_exactly(source, int.from_bytes(header[:8], byteorder=byteorder, signed=True))
+
+    return b"".join((head, md5, header, data))
+
+
 class ColumnInfo:
     """
     Represent the type of a column in the encoded file
@@ -118,6 +233,58 @@ class ColumnInfo:
         )
 
 
+class _ColumnHeaders:
+    """
+    The parsed column headers of a frame. These are shared between all frames whose encoded column headers are
+    identical, which is common in files made up of many small frames.
+
+    Attributes:
+        codecs(list): The codec of each column
+        columns(list): A :class:`.ColumnInfo` describing each column
+        fingerprint(tuple): The column structure, as compared when aggregating frames
+        digest(str): A digest of the fingerprint, as stored in frame indexes
+    """
+
+    def __init__(self, codecs):
+        self.codecs = codecs
+        self.columns = [
+            ColumnInfo(
+                codec.column_name,
+                idx,
+                codec.type,
+                codec.data_size,
+                [
+                    ColumnInfo.Bitfield(name=nm, size=sz, offset=off)
+                    for nm, sz, off in zip(
+                        codec.bitfield_names,
+                        codec.bitfield_sizes,
+                        accumulate(chain([0], codec.bitfield_sizes)),
+                    )
+                ],
+            )
+            for idx, codec in enumerate(codecs)
+        ]
+        self.fingerprint = tuple(
+            (c.name, c.dtype, c.datasize, tuple((b.name, b.size, b.offset) for b in c.bitfields)) for c in self.columns
+        )
+        self.digest = hashlib.md5(repr(self.fingerprint).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _parse_column_headers(encoded, ncolumns, stream_class):
+    """
+    Parse the encoded column headers of a frame. The results are cached, keyed by the encoded bytes, so frames that
+    repeat the same column headers only parse them once.
+
+    Returns:
+        _ColumnHeaders
+    """
+    stream = stream_class(BufferReader(encoded))
+    codecs = [read_codec(stream) for _ in range(ncolumns)]
+    assert stream.position() == len(encoded)
+    return _ColumnHeaders(codecs)
+
+
 class Frame:
     """
     Represent the decoded dataframe
@@ -135,6 +302,7 @@ class Frame:
     def __init__(self, source):
         # Read marker and magic
 
+        self._startPosition = source.tell()
         m = source.read(2)
         if len(m) == 0:
             raise EOFError()
@@ -183,8 +351,7 @@ class Frame:
         self._numberOfColumns = stream.readInt32()
         self._columnPosition = stream.position()
 
-        self.__columnCodecs = None
-        self._columns = None
+        self.__columnHeaders = None
 
         self._stream = stream
 
@@ -194,45 +361,77 @@ class Frame:
     def seekToEnd(self):
         self._stream.seek(self._dataEndPosition)
 
+    @property
+    def _column_headers(self):
+        """
+        Internal method to get the parsed column headers.
+        These are read lazily from the file handle so that we can do scans through the file rapidly, and are shared
+        with any other frame that has identical column headers.
+
+        Returns:
+            _ColumnHeaders
+        """
+        if self.__columnHeaders is None:
+            self._stream.seek(self._columnPosition)
+            encoded = bytes(self._stream.read(self._dataStartPosition - self._columnPosition))
+            self.__columnHeaders = _parse_column_headers(encoded, self._numberOfColumns, type(self._stream))
+        return self.__columnHeaders
+
     @property
     def _column_codecs(self):
         """
         Internal method to get the codecs for the given column.
-        These are read/constructed lazily from the file handle so that we can do scans through the file rapidly.
 
         Returns:
             list: A list of codecs
         """
-        if self.__columnCodecs is None:
-            self._stream.seek(self._columnPosition)
-            self.__columnCodecs = [read_codec(self._stream) for _ in range(self._numberOfColumns)]
-            assert self._stream.position() == self._dataStartPosition
-        return self.__columnCodecs
+        return self._column_headers.codecs
 
     @property
     def columns(self):
-        return [
-            ColumnInfo(
-                codec.column_name,
-                idx,
-                codec.type,
-                codec.data_size,
-                [
-                    ColumnInfo.Bitfield(name=nm, size=sz, offset=off)
-                    for nm, sz, off in zip(
-                        codec.bitfield_names,
-                        codec.bitfield_sizes,
-                        accumulate(chain([0], codec.bitfield_sizes)),
-                    )
-                ],
-            )
-            for idx, codec in enumerate(self._column_codecs)
-        ]
+        return list(self._column_headers.columns)
 
     @property
     def column_dict(self):
         return {c.name: c for c in self.columns}
 
+    @property
+    def _schema_fingerprint(self):
+        """
+        A digest of the column structure. Frames with matching fingerprints have matching columns, and can be aggregated
+        """
+        return self._column_headers.digest
+
+    @property
+    def constant_columns(self):
+        """
+        The columns that have the same value in every row. Their value is given by the frame header, rather than stored
+        in each row, so they can be skipped without decoding the frame.
+
+        Returns:
+            dict: The value of each constant column, by name
+        """
+        first_marker = self._first_marker()
+        constants = {
+            codec.column_name: codec.decode(None)
+            for idx, codec in enumerate(self._column_codecs)
+            if codec.constant and idx >= first_marker
+        }
+        for frame in self._trailingAggregatedFrames:
+            other = frame.constant_columns
+            constants = {name: value for name, value in constants.items() if name in other and other[name] == value}
+        return constants
+
+    def _first_marker(self):
+        """
+        The marker of the first row. Columns before it are not encoded in the first row, and are missing until they are
+        first encoded (see ODB-533)
+        """
+        if self._numberOfRows == 0:
+            return 0
+        self._stream.seek(self._dataStartPosition)
+        return self._stream.readMarker()
+
     @property
     def simple_column_dict(self):
         return {c.name.split("@")[0]: c for c in self.columns}
@@ -243,24 +442,42 @@ class Frame:
 
     @property
     def ncolumns(self):
-        if self.__columnCodecs is not None:
-            assert self._numberOfColumns == len(self.__columnCodecs)
+        if self.__columnHeaders is not None:
+            assert self._numberOfColumns == len(self.__columnHeaders.codecs)
         return self._numberOfColumns
 
-    def dataframe(self, columns=None):
+    def dataframe(self, columns=None, strings="object", nullable=False, downcast=False):
         """
         Decodes the frame into a pandas dataframe
 
         Parameters:
             columns: List of columns to decode
+            strings(str): Decode string columns as ``"object"`` columns of ``str``, or as pandas ``"categorical"``
+                          columns built directly from the dictionary of strings in the frame
+            nullable(bool): Decode integer and bitfield columns as pandas nullable ``Int64`` columns, rather than as
+                            ``float64`` columns if they contain missing values
+            downcast(bool): Decode numeric columns into the smallest dtypes that hold the range of values given by
+                            the codecs of the frame (see :meth:`narrow_dtypes`)
 
         Returns:
             DataFrame
         """
+        check_strings(strings)
+        decode_columns, bitfields = self._resolve_columns(columns)
+        dtypes = self.narrow_dtypes(nullable) if downcast else None
+        df = self._dataframe_internal(decode_columns, strings, nullable, dtypes)
+        return self._extract_bitfields(df, columns, bitfields)
+
+    def _resolve_columns(self, columns):
+        """
+        Determine which columns need to be decoded to produce the requested columns, and which of the requested
+        columns are bitfields to be extracted from them.
 
+        Returns:
+            tuple: The list of columns to decode, and a list of (bitfield name, column name, output name) tuples
+        """
         # Are there any bitfield columns we need to consider?
 
-        original_columns = columns
         bitfields = []
 
         if columns is not None:
@@ -289,8 +506,9 @@ class Frame:
                         bitfields.append((bitfield_name, column_name, colname))
             columns = list(final_columns)
 
-        df = self._dataframe_internal(columns)
+        return columns, bitfields
 
+    def _extract_bitfields(self, df, original_columns, bitfields):
         # If there are any bitfields that need extraction, do it here, and remove any temporarily
         # decoded columns as is possible
 
@@ -303,10 +521,15 @@ class Frame:
                 except StopIteration:
                     raise KeyError(f"Bitfield '{bitfield_name}' not found")
 
-                # If there are missing values in the column, then it will have been decoded as a float64 to support NaN
+                # If there are missing values in the column, then it will have been decoded as a float64 to support NaN,
+                # unless it has been decoded as a nullable integer column, which can be extracted from directly
                 raw_column = df[column_name]
                 missing_vals = None
-                if raw_column.dtype == np.float64:
+                if isinstance(raw_column.array, pd.arrays.IntegerArray):
+                    df[output_name] = extract_nullable_bitfield(raw_column.array, bf)
+                    extracted_columns.add(column_name)
+                    continue
+                if raw_column.dtype.kind == "f":
                     missing_vals = np.isnan(raw_column)
                     raw_column = raw_column.fillna(value=0).astype("int64")
 
@@ -332,31 +555,29 @@ class Frame:
 
         return df
 
-    def _dataframe_internal(self, columns=None):
+    def _dataframe_internal(self, columns=None, strings="object", nullable=False, dtypes=None):
         """
         Decodes the frame into a pandas dataframe
 
         Parameters:
             columns: List of columns to decode
+            strings(str): Decode string columns as ``"object"`` or ``"categorical"`` columns
+            nullable(bool): Decode integer and bitfield columns as pandas nullable ``Int64`` columns
+            dtypes(dict): The dtypes to decode numeric columns into, by column name
 
         Returns:
             DataFrame
         """
-        # TODO: Properly skip decoding columns that aren't needed
         column_codecs = self._column_codecs
 
-        self._stream.seek(self._dataStartPosition)
-
-        output_cols = [[] for _ in range(self._numberOfColumns)]
-
         # Select the correct output columns. Note we allow selection of fully-qualified
         # names, but we also allow selection of short names of the form <name>@<table> (so
         # long as these names are not ambiguous
         output = {}
         full_matches = set()
-        for codec, output_col in zip(column_codecs, output_cols):
+        for idx, codec in enumerate(column_codecs):
             if columns is None or codec.column_name in columns:
-                output[codec.column_name] = output_col
+                output[codec.column_name] = idx
                 full_matches.add(codec.column_name)
             else:
                 splitname = codec.column_name.split("@")
@@ -369,59 +590,166 @@ class Frame:
                             if name in full_matches:
                                 continue
                             raise KeyError("Ambiguous short column name '{}' requested".format(name))
-                        output[name] = output_col
+                        output[name] = idx
 
         if columns:
             for name in columns:
                 if name not in output:
                     raise KeyError(f"Requested columns '{name}' not found")
 
-        lastDecoded = [0] * self._numberOfColumns
+        # Only the selected columns are decoded. The others are skipped over using the codec widths
+        decoded = self._decode_columns(set(output.values()), strings, nullable, dtypes)
+        df = pd.DataFrame({name: decoded[idx] for name, idx in output.items()})
 
-        lastStartCol = None
+        if len(self._trailingAggregatedFrames) > 0:
+            trailing = self._trailingAggregatedFrames
+            return concat_frames([df] + [f._dataframe_internal(columns, strings, nullable, dtypes) for f in trailing])
+        else:
+            return df
+
+    def _row_layout(self, data):
+        """
+        Locate the start of each row in the data section, and the row marker (the index of the first
+        column encoded in that row). This is the only inherently sequential part of decoding, as the
+        size of each row depends on its marker, so it is kept to integer arithmetic on the raw bytes.
+
+        Returns:
+            tuple: Arrays of the row start offsets, the row markers, and the number of bytes used to encode
+                   the columns from each column index onwards
+        """
+        widths = [codec.encoded_size for codec in self._column_codecs]
+        tail_sizes = list(accumulate(reversed(widths), initial=0))[::-1]
+        row_sizes = [2 + sz for sz in tail_sizes]
+
+        starts = [0] * self._numberOfRows
+        markers = [0] * self._numberOfRows
+        pos = 0
         for row in range(self._numberOfRows):
-            startCol = self._stream.readMarker()
+            marker = (data[pos] << 8) | data[pos + 1]
+            starts[row] = pos
+            markers[row] = marker
+            pos += row_sizes[marker]
+        assert pos == len(data)
 
-            if lastStartCol is None:
-                if startCol > 0:
-                    for col in range(startCol):
-                        output_cols[col].append(column_codecs[col].typed_missing_value)
+        return np.array(starts, dtype=np.int64), np.array(markers, dtype=np.int64), np.array(tail_sizes)
 
-            elif lastStartCol > startCol:
-                for col in range(startCol, lastStartCol):
-                    last = output_cols[col][-1]
-                    output_cols[col].extend(last for _ in range(row - lastDecoded[col] - 1))
+    def _decode_columns(self, indexes, strings="object", nullable=False, dtypes=None):
+        """
+        Decode the specified columns in the frame with NumPy, rather than value by value.
 
-            lastStartCol = startCol
+        The data section is read as one buffer. Each column is gathered from the rows that explicitly encode
+        it, and the values are then propagated forwards into the rows which only encode later columns.
+        Columns which are not requested are never touched, and nor is the data section if only constant
+        columns are requested.
 
-            for col in range(startCol, self._numberOfColumns):
-                output_cols[col].append(column_codecs[col].decode(self._stream))
-                lastDecoded[col] = row
+        Parameters:
+            indexes: The indexes of the columns to decode
+            strings(str): Decode string columns as ``"object"`` arrays, or as ``"categorical"`` columns built from
+                          the codes into the frame's dictionary of strings
+            nullable(bool): Decode integer and bitfield columns as pandas nullable ``Int64`` columns, with the missing
+                            values masked rather than converted to ``NaN``
+            dtypes(dict): The dtypes to decode numeric columns into, by column name
 
-        if lastStartCol is not None:
-            for col in range(lastStartCol):
-                last = output_cols[col][-1]
-                output_cols[col].extend(last for _ in range(self._numberOfRows - lastDecoded[col] - 1))
+        Returns:
+            dict: Arrays of decoded values, keyed by column index
+        """
+        # Constant columns that are encoded in the first row have their value in every row
+        first_marker = self._first_marker()
+        output_cols = {
+            col: self._constant_column(self._column_codecs[col], 0, strings, nullable, dtypes)
+            for col in indexes
+            if self._column_codecs[col].constant and col >= first_marker
+        }
+        indexes = [col for col in indexes if col not in output_cols]
+        if not indexes:
+            return output_cols
 
-        df = pd.DataFrame(output)
+        self._stream.seek(self._dataStartPosition)
+        data = self._stream.read(self._dataSize)
+        buffer = np.frombuffer(data, dtype=np.uint8)
 
-        if len(self._trailingAggregatedFrames) > 0:
-            dfs = [df] + [f._dataframe_internal(columns) for f in self._trailingAggregatedFrames]
-            with warnings.catch_warnings():
-                # pandas 2.1.0 has a FutureWarning for concatenating DataFrames with Null entries
-                # It's not clear there's anything to do except suppress it.
-                # See https://github.com/pandas-dev/pandas/issues/55928
-                warnings.filterwarnings("ignore", category=FutureWarning)
-                return pd.concat(
-                    dfs,
-                    copy=False,
-                    axis=0,
-                    ignore_index=True,
+        starts, markers, tail_sizes = self._row_layout(data)
+
+        for col in indexes:
+            codec = self._column_codecs[col]
+            # Which rows encode this column, and which previously encoded row does each row take its value from.
+            # Rows before the first that encodes the column are missing (see ODB-533)
+            present = markers <= col
+            leading = int(np.argmax(present)) if present.any() else self._numberOfRows
+
+            if codec.constant:
+                output_cols[col] = self._constant_column(codec, leading, strings, nullable, dtypes)
+                continue
+
+            source = np.cumsum(present) - 1
+
+            offsets = starts[present] + 2 + tail_sizes[markers[present]] - tail_sizes[col]
+
+            if strings == "categorical" and codec.type == STRING:
+                codes, categories = codec._decode_codes(buffer, offsets, self._stream.byteOrder)
+                output_cols[col] = categorical_column(
+                    codes[source[leading:]], categories, codec.typed_missing_value, leading
                 )
-        else:
-            return df
+                continue
+
+            # Values are decoded straight into any narrower dtype, so they are never held at full width
+            dtype = (dtypes or {}).get(codec.column_name)
+            values, missing = codec._decode_array(buffer, offsets, self._stream.byteOrder, dtype)
+
+            values = values[source[leading:]]
+            if missing is not None:
+                missing = missing[source[leading:]]
+            if nullable and codec.type in (INTEGER, BITFIELD):
+                output_cols[col] = nullable_column(values, missing, leading, dtype)
+            else:
+                output_cols[col] = decoded_column(values, missing, codec.typed_missing_value, leading, dtype)
+
+        return output_cols
+
+    def _constant_column(self, codec, leading, strings, nullable, dtypes):
+        value = codec.decode(None)
+        if strings == "categorical" and codec.type == STRING:
+            codes = np.zeros(self._numberOfRows - leading, dtype=np.intp)
+            return categorical_column(codes, [value], codec.typed_missing_value, leading)
+        values = np.full(self._numberOfRows - leading, value, dtype=object if isinstance(value, str) else None)
+        dtype = (dtypes or {}).get(codec.column_name)
+        if nullable and codec.type in (INTEGER, BITFIELD):
+            return nullable_column(values, None, leading, dtype)
+        return decoded_column(values, None, codec.typed_missing_value, leading, dtype)
+
+    def narrow_dtypes(self, nullable=False):
+        """
+        The smallest dtypes that hold the values of the numeric columns, according to the codecs of this frame and
+        of any frames aggregated with it. Integer columns that may contain missing values need a floating point dtype,
+        unless they are decoded as nullable columns.
+
+        Parameters:
+            nullable(bool): Whether integer columns are to be decoded as nullable columns
+
+        Returns:
+            dict: The dtype of each column, by name. Columns with no narrower dtype than the default are omitted
+        """
+        dtypes = None
+        for frame in [self] + self._trailingAggregatedFrames:
+            # Columns before the marker of the first row are missing until they are first encoded (see ODB-533)
+            first_marker = frame._first_marker()
+            frame_dtypes = {}
+            for idx, codec in enumerate(frame._column_codecs):
+                dtype = codec.narrow_dtype(codec.has_missing or idx < first_marker, nullable)
+                if dtype is not None:
+                    frame_dtypes[codec.column_name] = dtype
+
+            if dtypes is None:
+                dtypes = frame_dtypes
+            else:
+                dtypes = {
+                    name: np.promote_types(dtype, frame_dtypes[name])
+                    for name, dtype in dtypes.items()
+                    if name in frame_dtypes
+                }
+        return dtypes
 
     def _append(self, frame: "Frame"):
-        if self.column_dict != frame.column_dict:
+        if self._column_headers.fingerprint != frame._column_headers.fingerprint:
             raise MismatchedFramesError
         self._trailingAggregatedFrames.append(frame)
@@ -0,0 +1,101 @@
+import json
+import os
+import warnings
+
+
+class FrameIndex:
+    """
+    An index of the frames within an ODB-2 file, which can be persisted alongside it so that the file
+    can be reopened without scanning through every frame header.
+
+    The index records the size and modification time of the file it describes, and is treated as stale
+    if either no longer matches.
+
+    Parameters:
+        frames(list): A dictionary per frame, describing the frame
+        size(int): The size of the indexed file in bytes
+        mtime(int): The modification time of the indexed file in nanoseconds
+
+    Attributes:
+        frames(list): A dictionary per frame, containing the byte ``offset`` and ``length`` of the frame, the
+                      number of rows (``nrows``) and columns (``ncolumns``), a ``fingerprint`` of the column
+                      structure and the frame ``properties``
+    """
+
+    version = 1
+
+    def __init__(self, frames, size, mtime):
+        self.frames = frames
+        self.size = size
+        self.mtime = mtime
+
+    @staticmethod
+    def entry(frame):
+        """
+        Describe a (non-aggregated) frame for inclusion in the index
+        """
+        return {
+            "offset": frame._startPosition,
+            "length": frame._dataEndPosition - frame._startPosition,
+            "nrows": frame._numberOfRows,
+            "ncolumns": frame._numberOfColumns,
+            "fingerprint": frame._schema_fingerprint,
+            "properties": frame.properties,
+        }
+
+    @classmethod
+    def load(cls, path, size, mtime):
+        """
+        Load an index from disk.
+
+        Returns:
+            FrameIndex: The index, or ``None`` if it does not exist, cannot be read, or is stale
+        """
+        try:
+            with open(path, "r") as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if content.get("version") != cls.version or content.get("size") != size or content.get("mtime") != mtime:
+            return None
+
+        return cls(content["frames"], size, mtime)
+
+    def save(self, path):
+        content = {"version": self.version, "size": self.size, "mtime": self.mtime, "frames": self.frames}
+        try:
+            with open(path, "w") as f:
+                json.dump(content, f)
+        except OSError as e:
+            warnings.warn(f"Unable to write frame index {path}: {e}")
+
+    def groups(self, aggregated):
+        """
+        Group the frames into the logical frames that the reader will present
+
+        Returns:
+            list: A list of lists of indexes into :attr:`frames`
+        """
+        groups = []
+        for i, frame in enumerate(self.frames):
+            if aggregated and groups and self.frames[groups[-1][0]]["fingerprint"] == frame["fingerprint"]:
+                groups[-1].append(i)
+            else:
+                groups.append([i])
+        return groups
+
+
+def index_path(source, index):
+    """
+    Determine where the index for a source is stored, given the ``index`` argument to the :class:`.Reader`
+    """
+    if not index:
+        return None
+    if isinstance(index, (str, os.PathLike)):
+        return index
+
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", None)
+    if not isinstance(name, (str, os.PathLike)):
+        raise ValueError("A path for the frame index must be supplied for sources without a file name")
+    return f"{os.fspath(name)}.idx"
@@ -0,0 +1,22 @@
+from collections import deque
+
+
+def ordered_map(executor, fn, iterable, max_pending):
+    """
+    Apply a function to each item of an iterable using an executor, yielding the results in order.
+
+    Unlike :meth:`concurrent.futures.Executor.map`, the iterable is consumed incrementally, with at most
+    ``max_pending`` tasks submitted ahead of the results that have been yielded. This bounds the memory
+    used by inputs and results that are in flight.
+    """
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(fn, *item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
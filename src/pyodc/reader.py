@@ -1,8 +1,46 @@
 import io
+import mmap
+import os
+import stat
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
 
 import pandas
 
-from .frame import Frame, MismatchedFramesError
+from .frame import Frame, MismatchedFramesError, check_strings, concat_frames, read_frame_data, unify_categories
+from .index import FrameIndex, index_path
+from .parallel import ordered_map
+from .stream import BufferReader
+
+
+def _is_raw_file(f):
+    """
+    Whether a stream reads the bytes of its underlying file unchanged. The file descriptor of other streams, such as
+    decompressors, does not give the bytes that the stream reads.
+    """
+    if isinstance(f, io.BufferedReader):
+        f = f.raw
+    return isinstance(f, io.FileIO)
+
+
+def _memory_map(f):
+    """
+    Memory map an open file, if it is a non-empty regular file.
+
+    Returns:
+        BufferReader: A reader over the mapped file positioned as the file was, or ``None`` if the file cannot be mapped
+    """
+    try:
+        fileno = f.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+    st = os.fstat(fileno)
+    if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+        return None
+
+    return BufferReader(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ), position=f.tell())
 
 
 class Reader:
@@ -10,61 +48,284 @@ class Reader:
     An object that owns the input data stream, and splits it into a sequence of frames that can be interrogated
 
     Parameters:
-        source(str|file): A file-like object to decode the data from
+        source(str|file): A file-like object to decode the data from. Streams that cannot seek, such as pipes and
+                          sockets, are read forwards, holding one frame in memory at a time when iterating lazily
         aggregated(bool): Group result into logical dataframes if ``True``
+        memory_map(bool): Read the data through a memory map of the file, rather than through buffered reads.
+                          If ``None``, regular files opened by path or as raw binary files are memory mapped, and
+                          other sources, such as decompressing streams, are read directly
+        index(bool|str): Use a persistent index of the frames in the file. If ``True``, the index is stored alongside
+                         the file with an additional ``.idx`` suffix, otherwise it is stored at the supplied path. The
+                         index is built when the file is first scanned, and rebuilt if the file changes
+        lazy(bool): Defer scanning the frames until they are used. Iterating over the reader then reads the frames
+                    one at a time, rather than scanning the whole file first
 
     Attributes:
         frames(DataFrame): Decoded dataframes
     """
 
-    def __init__(self, source, aggregated=True):
+    def __init__(self, source, aggregated=True, memory_map=None, index=None, lazy=False):
         self.__aggregated = aggregated
-        self._frames = []
+        self.__groups = None
+        self._frames = None
+        self._index = None
+        self._index_file = index_path(source, index)
+        self._loaded_frames = {}
 
-        if isinstance(source, io.IOBase):
+        if hasattr(source, "read"):
             self._f = source
         else:
             self._f = open(source, "rb")
 
+        # Streams that cannot seek, such as pipes and sockets, are read forwards one frame at a time
+        self._forward_only = not (hasattr(self._f, "seekable") and self._f.seekable())
+        if self._forward_only and (self._index_file is not None or memory_map):
+            raise ValueError("Frame indexes and memory mapping require a seekable source")
+
+        if self._index_file is not None:
+            try:
+                st = os.fstat(self._f.fileno())
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                raise ValueError("Frame indexes can only be used with files")
+            self._file_stat = (st.st_size, st.st_mtime_ns)
+            self._index = FrameIndex.load(self._index_file, *self._file_stat)
+
+        # Only streams known to read their file unchanged are mapped unless this is explicitly requested
+        if memory_map is None and self._f is source and not _is_raw_file(source):
+            memory_map = False
+
+        if (memory_map or memory_map is None) and not self._forward_only:
+            mapped = _memory_map(self._f)
+            if mapped is not None:
+                # The mapping remains valid once the file is closed
+                if self._f is not source:
+                    self._f.close()
+                self._f = mapped
+            elif memory_map:
+                raise ValueError("Source cannot be memory mapped")
+
+        self._start = None if self._forward_only else self._f.tell()
+
+        # If there is a valid index, frames are only read as they are needed. Otherwise scan the file
+        # now, unless this is deferred until the frames are used.
+
+        if self._index is None and not lazy:
+            self._frames = list(self._scan())
+
+    def _scan(self):
+        """
+        Scan through the frames in the data stream, aggregating them into logical frames as they are found.
+        Logical frames are yielded as soon as they are complete, and an index is written (if one has been
+        requested) once the end of the stream is reached.
+        """
+        entries = []
+        current = None
+        position = self._start
+
         while True:
             try:
-                self._frames.append(Frame(self._f))
-                self._frames[-1].seekToEnd()
+                if self._forward_only:
+                    frame = Frame(BufferReader(read_frame_data(self._f)))
+                else:
+                    # The data stream may be used for decoding frames between iterations
+                    self._f.seek(position)
+                    frame = Frame(self._f)
             except EOFError:
                 # n.b. f.read() does not throw EOFError, so this will only catch the exception
                 # thrown internally when the table marker is not found
                 break
+            position = frame._dataEndPosition
+
+            if self._index_file is not None:
+                entries.append(FrameIndex.entry(frame))
 
-        if self.__aggregated:
-            if len(self._frames) > 1:
-                aggregated_frames = [self._frames[0]]
-                for frame in self._frames[1:]:
-                    try:
-                        aggregated_frames[-1]._append(frame)
-                    except MismatchedFramesError:
-                        aggregated_frames.append(frame)
-                self._frames = aggregated_frames
+            if not self.__aggregated:
+                yield frame
+                continue
+
+            if current is not None:
+                try:
+                    current._append(frame)
+                    continue
+                except MismatchedFramesError:
+                    yield current
+            current = frame
+
+        if current is not None:
+            yield current
+
+        if self._index_file is not None:
+            self._index = FrameIndex(entries, *self._file_stat)
+            self._index.save(self._index_file)
+
+    @property
+    def _groups(self):
+        if self.__groups is None:
+            self.__groups = self._index.groups(self.__aggregated)
+        return self.__groups
+
+    def _load_frame(self, group):
+        frames = []
+        for idx in group:
+            self._f.seek(self._index.frames[idx]["offset"])
+            frames.append(Frame(self._f))
+        for frame in frames[1:]:
+            frames[0]._append(frame)
+        return frames[0]
 
     @property
     def frames(self):
+        if self._frames is None:
+            if self._index is not None:
+                self._frames = [self.frame(i) for i in range(len(self._groups))]
+            else:
+                self._frames = list(self._scan())
         return self._frames
 
+    def frame(self, i):
+        """
+        Get the i'th frame. If a frame index is in use, this only reads the headers of the requested frame
+
+        Parameters:
+            i(int): The index of the frame
 
-def _read_odb_generator(source, columns=None, aggregated=True):
-    r = Reader(source, aggregated=aggregated)
-    for f in r.frames:
-        yield f.dataframe(columns)
+        Returns:
+            Frame
+        """
+        if self._frames is None and self._index is not None:
+            if i not in self._loaded_frames:
+                self._loaded_frames[i] = self._load_frame(self._groups[i])
+            return self._loaded_frames[i]
+        return self.frames[i]
 
+    def __iter__(self):
+        """
+        Iterate through the frames. If they have not already been read, frames are read as the iteration
+        proceeds, and are not retained by the reader.
+        """
+        if self._frames is not None:
+            return iter(self._frames)
+        if self._index is not None:
+            return (self._load_frame(group) for group in self._groups)
+        return self._scan()
 
-def _read_odb_oneshot(source, columns=None):
-    reduced = pandas.concat(_read_odb_generator(source, columns), sort=False, ignore_index=True)
+    @property
+    def row_offsets(self):
+        """
+        The position of the first row of each frame within the whole data stream
+        """
+        if self._frames is None and self._index is not None:
+            counts = [sum(self._index.frames[idx]["nrows"] for idx in group) for group in self._groups]
+        else:
+            counts = [f.nrows for f in self.frames]
+        return list(accumulate(counts, initial=0))[:-1]
+
+
+def _read_odb_generator(
+    source, columns=None, aggregated=True, memory_map=None, index=None, strings="object", nullable=False, downcast=False
+):
+    r = Reader(source, aggregated=aggregated, memory_map=memory_map, index=index, lazy=True)
+    for f in r:
+        yield f.dataframe(columns, strings, nullable, downcast)
+
+
+# The file being decoded, opened once in each worker process by _open_worker_file
+_worker_file = None
+
+
+def _open_worker_file(path, memory_map):
+    """
+    Open the file being decoded in a worker process, memory mapping it unless this has been disabled
+    """
+    global _worker_file
+    _worker_file = open(path, "rb")
+    if memory_map is not False:
+        mapped = _memory_map(_worker_file)
+        if mapped is not None:
+            _worker_file.close()
+            _worker_file = mapped
+
+
+def _frame_task(frame, path):
+    """
+    Describe where a frame can be found, so that it can be decoded in another process. Frames in files are
+    referred to by position in the file opened by the worker, otherwise their encoded data is copied.
+    """
+    if path is not None:
+        return None, frame._startPosition
+
+    frame._stream.seek(frame._startPosition)
+    return bytes(frame._stream.read(frame._dataEndPosition - frame._startPosition)), 0
+
+
+def _decode_frame_task(data, position, columns, strings, nullable, dtypes):
+    """
+    Decode a (non-aggregated) frame described by :func:`_frame_task` in a worker process
+    """
+    f = _worker_file if data is None else BufferReader(data)
+    f.seek(position)
+    return Frame(f)._dataframe_internal(columns, strings, nullable, dtypes)
+
+
+def _read_odb_parallel(
+    source,
+    columns=None,
+    aggregated=True,
+    memory_map=None,
+    index=None,
+    workers=None,
+    strings="object",
+    nullable=False,
+    downcast=False,
+):
+    r = Reader(source, aggregated=aggregated, memory_map=memory_map, index=index, lazy=True)
+    path = source if isinstance(source, (str, os.PathLike)) else None
+
+    # Each of the frames that make up an aggregated frame is decoded separately, so that the work is spread
+    # across the workers. The results are reassembled here. Any narrowed dtypes are agreed between the frames
+    # before they are distributed.
+
+    logical_frames = deque()
+
+    def tasks():
+        for frame in r:
+            decode_columns, bitfields = frame._resolve_columns(columns)
+            dtypes = frame.narrow_dtypes(nullable) if downcast else None
+            parts = [frame] + frame._trailingAggregatedFrames
+            logical_frames.append((frame, bitfields, len(parts)))
+            for part in parts:
+                yield (*_frame_task(part, path), decode_columns, strings, nullable, dtypes)
+
+    initializer = None if path is None else _open_worker_file
+    with ProcessPoolExecutor(workers, initializer=initializer, initargs=(path, memory_map)) as executor:
+        results = ordered_map(executor, _decode_frame_task, tasks(), 2 * workers)
+        for df in results:
+            frame, bitfields, nparts = logical_frames.popleft()
+            if nparts > 1:
+                df = concat_frames([df] + [next(results) for _ in range(nparts - 1)])
+            yield frame._extract_bitfields(df, columns, bitfields)
+
+
+def _read_odb_oneshot(dataframes):
+    reduced = pandas.concat(unify_categories(dataframes), sort=False, ignore_index=True)
     for name, data in reduced.items():
         if data.dtype == "object":
             data.where(pandas.notnull(data), None, inplace=True)
     return reduced
 
 
-def read_odb(source, columns=None, aggregated=True, single=False):
+def read_odb(
+    source,
+    columns=None,
+    aggregated=True,
+    single=False,
+    memory_map=None,
+    index=None,
+    workers=None,
+    strings="object",
+    nullable=False,
+    downcast=False,
+):
     """
     Decode an ODB-2 stream into a pandas dataframe
 
@@ -73,12 +334,49 @@ def read_odb(source, columns=None, aggregated=True, single=False):
         columns(list|tuple): A list or a tuple of columns to decode
         aggregated(bool): Group result into logical dataframes if ``True``
         single(bool): Group result into a single dataframe if ``True`` and possible
+        memory_map(bool): Read the data through a memory map of the file (see :class:`.Reader`)
+        index(bool|str): Use a persistent index of the frames in the file (see :class:`.Reader`)
+        workers(int): Decode frames in parallel using a pool of this many processes. The decoded frames are returned
+                      in order, and only a limited number of frames are decoded ahead of those consumed
+        strings(str): Decode string columns as ``"object"`` columns of ``str``, or as pandas ``"categorical"``
+                      columns built directly from the dictionary of strings in each frame. Categories are unified
+                      when frames are aggregated or combined
+        nullable(bool): Decode integer and bitfield columns as pandas nullable ``Int64`` columns, rather than as
+                        ``float64`` columns if they contain missing values. Bitfields extracted from them are also
+                        nullable (``Int64``, or ``boolean`` for single bits)
+        downcast(bool): Decode numeric columns into the smallest dtypes that hold every value, as given by the codec
+                        ranges in the frame headers. The dtypes are agreed between aggregated frames
 
     Returns:
         DataFrame
     """
+    check_strings(strings)
+    if workers is not None and workers > 1:
+        dataframes = _read_odb_parallel(
+            source,
+            columns,
+            aggregated,
+            memory_map=memory_map,
+            index=index,
+            workers=workers,
+            strings=strings,
+            nullable=nullable,
+            downcast=downcast,
+        )
+    else:
+        dataframes = _read_odb_generator(
+            source,
+            columns,
+            aggregated,
+            memory_map=memory_map,
+            index=index,
+            strings=strings,
+            nullable=nullable,
+            downcast=downcast,
+        )
+
     if single:
         assert aggregated
-        return _read_odb_oneshot(source, columns)
+        return _read_odb_oneshot(dataframes)
     else:
-        return _read_odb_generator(source, columns, aggregated)
+        return dataframes
@@ -4,7 +4,7 @@ At this point, we don't worry about being able to encode with cross-endianness.
 That may be useful at some point
 """
 import struct
-from io import SEEK_SET
+from io import SEEK_CUR, SEEK_END, SEEK_SET
 
 
 class Stream:
@@ -78,7 +78,7 @@ class Stream:
         return int.from_bytes(self.read(8), byteorder=self.byteOrder, signed=True)
 
     def readString(self):
-        return self.readByteString().decode("utf-8")
+        return str(self.readByteString(), "utf-8")
 
     def readByteString(self):
         return self.read(self.readInt32())
@@ -100,3 +100,35 @@ class BigEndianStream(Stream):
     byteOrder = "big"
     floatMarker = ">f"
     doubleMarker = ">d"
+
+
+class BufferReader:
+    """
+    A minimal read-only file-like object over an in-memory buffer, such as a memory-mapped file.
+
+    Reads return zero-copy memoryview slices of the underlying buffer, rather than new bytes objects.
+    """
+
+    def __init__(self, buffer, position=0):
+        self._view = memoryview(buffer)
+        self._position = position
+
+    def read(self, n: int = -1):
+        start = self._position
+        end = len(self._view) if n is None or n < 0 else min(start + n, len(self._view))
+        self._position = end
+        return self._view[start:end]
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_CUR:
+            offset += self._position
+        elif whence == SEEK_END:
+            offset += len(self._view)
+        self._position = offset
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def seekable(self):
+        return True
@@ -1,8 +1,13 @@
+import gzip
+import io
 import os
 
+import pandas
 import pytest
 from conftest import odc_modules
 
+import pyodc
+
 data_file1 = os.path.join(os.path.dirname(__file__), "data/data1.odb")
 
 
@@ -41,5 +46,104 @@ def test_count_aggregated_file(odyssey):
     assert sum(t.nrows for t in frames) == 13
 
 
+@pytest.mark.parametrize("memory_map", [None, True, False])
+def test_count_memory_map(memory_map):
+    r = pyodc.Reader(data_file1, aggregated=False, memory_map=memory_map)
+
+    frames = r.frames
+    assert len(frames) == 11
+    assert sum(t.nrows for t in frames) == 13
+
+    pandas.testing.assert_frame_equal(
+        pyodc.read_odb(data_file1, single=True, memory_map=memory_map),
+        pyodc.read_odb(data_file1, single=True, memory_map=False),
+    )
+
+
+def test_memory_map_unsupported():
+    with open(data_file1, "rb") as f:
+        data = f.read()
+
+    with pytest.raises(ValueError):
+        pyodc.Reader(io.BytesIO(data), memory_map=True)
+
+    # By default, sources that cannot be mapped are read directly
+    assert len(pyodc.Reader(io.BytesIO(data), aggregated=False).frames) == 11
+
+
+def test_memory_map_compressed(tmp_path):
+    """
+    The file descriptor of a decompressing stream refers to the compressed file, so it must be read directly
+    """
+    with open(data_file1, "rb") as f:
+        data = f.read()
+    path = tmp_path / "data1.odb.gz"
+    with gzip.open(path, "wb") as f:
+        f.write(data)
+
+    with gzip.open(path, "rb") as f:
+        assert len(pyodc.Reader(f, aggregated=False).frames) == 11
+
+    with gzip.open(path, "rb") as f:
+        pandas.testing.assert_frame_equal(
+            pyodc.read_odb(f, single=True), pyodc.read_odb(data_file1, single=True, memory_map=False)
+        )
+
+
+@pytest.mark.parametrize("aggregated, nframes", [(True, 1), (False, 11)])
+def test_count_lazy(aggregated, nframes):
+    r = pyodc.Reader(data_file1, aggregated=aggregated, lazy=True)
+    assert r._frames is None
+
+    frames = list(r)
+    assert len(frames) == nframes
+    assert sum(t.nrows for t in frames) == 13
+
+    # Iteration does not retain the frames
+    assert r._frames is None
+    assert len(r.frames) == nframes
+
+
+def test_lazy_read_first_frame(monkeypatch):
+    """
+    Frames are yielded as soon as they have been decoded, before the rest of the file is scanned
+    """
+    created = []
+    frame_init = pyodc.Frame.__init__
+
+    def spy(self, source):
+        frame_init(self, source)
+        created.append(self)
+
+    monkeypatch.setattr(pyodc.Frame, "__init__", spy)
+
+    it = pyodc.read_odb(data_file1, aggregated=False)
+    next(it)
+    assert len(created) == 1
+
+    assert len(list(it)) == 10
+    assert len(created) == 11
+
+
+def test_shared_column_headers():
+    """
+    Frames with identical column headers share the parsed codecs, but are only aggregated if their column
+    structure matches
+    """
+    df = pandas.DataFrame({"a@hdr": [1, 2] * 10, "b@body": [1.5, 2.5] * 10})
+    f = io.BytesIO()
+    pyodc.encode_odb(df, f, rows_per_frame=4)
+    pyodc.encode_odb(df.rename(columns={"b@body": "c@body"}), f, rows_per_frame=4)
+
+    frames = pyodc.Reader(io.BytesIO(f.getvalue()), aggregated=False).frames
+    assert len(frames) == 10
+    assert all(frame._column_codecs is frames[0]._column_codecs for frame in frames[1:5])
+    assert frames[5]._column_codecs is not frames[0]._column_codecs
+
+    frames = pyodc.Reader(io.BytesIO(f.getvalue()), aggregated=True).frames
+    assert [frame.nrows for frame in frames] == [20, 20]
+    assert [c.name for c in frames[1].columns] == ["a@hdr", "c@body"]
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,107 @@
+import os
+
+import numpy
+import pandas
+import pytest
+from conftest import odc_modules
+
+import pyodc
+from pyodc.dataset import partition_keys
+
+
+@pytest.fixture(scope="module")
+def partitioned_dataset(tmp_path_factory):
+    """
+    A dataset partitioned by date and observation type. The two observation types have different columns.
+    """
+    root = tmp_path_factory.mktemp("dataset")
+    for date in (20200101, 20200102, 20200103):
+        for obstype, extra in (("synop", "name@hdr"), ("temp", "level@body")):
+            directory = root / f"date={date}" / f"obstype={obstype}"
+            directory.mkdir(parents=True)
+            df = pandas.DataFrame(
+                {
+                    "date@hdr": numpy.full(10, date),
+                    "value@body": numpy.linspace(0, 1, 10),
+                    extra: [f"stn{i}" for i in range(10)] if extra == "name@hdr" else numpy.arange(10),
+                }
+            )
+            pyodc.encode_odb(df, str(directory / "data.odb"))
+    # Other files are ignored
+    (root / "README").write_text("not odb")
+    return str(root)
+
+
+def test_partition_keys():
+    path = os.path.join("archive", "date=20200101", "obstype=synop", "data.odb")
+    assert partition_keys(path) == {"date": "20200101", "obstype": "synop"}
+    assert partition_keys("data.odb") == {}
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_dataset_to_pandas(odyssey, partitioned_dataset, workers):
+    ds = odyssey.dataset(partitioned_dataset, workers=workers)
+
+    assert len(ds.files) == 6
+    assert ds.nrows == 60
+    assert ds.schema == {
+        "date@hdr": pyodc.INTEGER,
+        "value@body": pyodc.DOUBLE,
+        "name@hdr": pyodc.STRING,
+        "level@body": pyodc.INTEGER,
+    }
+
+    df = ds.to_pandas()
+    assert list(df.columns) == list(ds.schema)
+    assert len(df) == 60
+    assert (df["date@hdr"].values == numpy.repeat([20200101, 20200102, 20200103], 20)).all()
+
+    # Columns absent from a file are missing
+    synop = df["name@hdr"].notnull()
+    assert synop.sum() == 30
+    assert df.loc[synop, "level@body"].isnull().all()
+    assert df.loc[~synop, "name@hdr"].isnull().all()
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_dataset_partition_filter(odyssey, partitioned_dataset):
+    ds = odyssey.dataset(partitioned_dataset, filter={"date": [20200101, 20200103], "obstype": "temp"})
+    assert [partition_keys(os.path.relpath(f, partitioned_dataset)) for f in ds.files] == [
+        {"date": "20200101", "obstype": "temp"},
+        {"date": "20200103", "obstype": "temp"},
+    ]
+    assert "name@hdr" not in ds.schema
+
+    ds = odyssey.dataset(partitioned_dataset, filter={"date": lambda d: d > "20200101"})
+    assert len(ds.files) == 4
+
+    # Files must be in a partition for every filtered key
+    assert odyssey.dataset(partitioned_dataset, filter={"station": "1"}).files == []
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_dataset_glob(odyssey, partitioned_dataset):
+    pattern = os.path.join(partitioned_dataset, "**", "*.odb")
+    ds = odyssey.dataset(pattern, filter={"obstype": "synop"})
+    assert len(ds.files) == 3
+    assert len(ds.to_pandas(columns=["value", "name"])) == 30
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_dataset_iter_columns(odyssey, partitioned_dataset):
+    ds = odyssey.dataset(partitioned_dataset, workers=2)
+    dfs = list(ds.iter_dataframes(columns=["value@body", "level@body"]))
+
+    assert len(dfs) == 6
+    for path, df in zip(ds.files, dfs):
+        assert list(df.columns) == ["value@body", "level@body"]
+        assert len(df) == 10
+        assert df["level@body"].isnull().all() == ("obstype=synop" in path)
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_dataset_empty(odyssey, tmp_path):
+    ds = odyssey.dataset(str(tmp_path))
+    assert ds.files == []
+    assert ds.to_pandas().empty
@@ -1,3 +1,5 @@
+import io
+import os
 from tempfile import NamedTemporaryFile
 
 import numpy.testing
@@ -5,6 +7,8 @@ import pandas
 import pytest
 from conftest import ODC_VERSION, codc, odc_modules
 
+import pyodc
+
 SAMPLE_DATA = {
     "col1": [1, 2, 3, 4, 5, 6, 7],
     "col2": [0, 0, 0, 0, 0, 0, 0],
@@ -399,3 +403,273 @@ def test_cross_library_encode_decode(encode_odc, decode_odc):
         f.flush()
         df2 = decode_odc.read_odb(f.name, single=True)
         assert_dataframe_equal(df1, df2)
+
+
+@pytest.mark.parametrize("odyssey, bigendian", [(d, False) for d in odc_modules] + [(pyodc, True)])
+def test_decode_repeated_values(odyssey, bigendian):
+    """
+    Rows only encode the columns from the first one that changes, so the decoder must carry the
+    other values forward from previous rows.
+    """
+    df = pandas.DataFrame(
+        {
+            "slow@hdr": [1, 1, 1, 2, 2, 2, 3, 3],
+            "string@hdr": ["a", "a", "a", "b", "b", "b", "b", "c"],
+            "missing@hdr": [None, None, None, 4, 4, 4, 5, 5],
+            "fast@body": [1.5, 2.5, 3.5, 4.5, 4.5, 6.5, 7.5, 8.5],
+        }
+    )
+
+    with NamedTemporaryFile() as fencode:
+        pyodc.encode_odb(df, fencode, rows_per_frame=5, bigendian=bigendian)
+        fencode.flush()
+
+        df2 = odyssey.read_odb(fencode.name, single=True)
+        assert_dataframe_equal(df, df2)
+
+
+@pytest.mark.parametrize("encoder", odc_modules)
+@pytest.mark.parametrize("decoder", odc_modules)
+def test_decode_nullable_integers(encoder, decoder):
+    """
+    Integer and bitfield columns, and the bitfields extracted from them, can be decoded as nullable columns
+    """
+    bitfield_columns = ["col15.bf1", "col15.bfextended", "col15.bf3"]
+    with NamedTemporaryFile() as fencode:
+        encode_sample(encoder, fencode)
+        df = decoder.read_odb(fencode.name, single=True)
+        nullable = decoder.read_odb(fencode.name, single=True, nullable=True)
+        bitfields = decoder.read_odb(fencode.name, single=True, columns=bitfield_columns)
+        nullable_bitfields = decoder.read_odb(fencode.name, single=True, columns=bitfield_columns, nullable=True)
+
+    for name in ["col1", "col2", "col3", "col5", "col11", "col12", "col13", "col14", "col15", "constant_bitfield"]:
+        assert nullable[name].dtype == "Int64"
+        numpy.testing.assert_array_equal(nullable[name].isna(), df[name].isna())
+        numpy.testing.assert_array_equal(nullable[name].dropna(), df[name].dropna())
+
+    for name in ["col4", "col6", "col9"]:
+        pandas.testing.assert_series_equal(nullable[name], df[name])
+
+    assert nullable_bitfields.dtypes.to_dict() == {
+        "col15.bf1": "boolean",
+        "col15.bfextended": "Int64",
+        "col15.bf3": "boolean",
+    }
+    for name in bitfield_columns:
+        assert list(nullable_bitfields[name].isna()) == [False, False, True, False, False, False, False]
+        assert list(nullable_bitfields[name].dropna()) == list(bitfields[name].dropna())
+
+
+@pytest.mark.parametrize("encoder", odc_modules)
+@pytest.mark.parametrize("decoder", odc_modules)
+@pytest.mark.parametrize("nullable", [False, True])
+def test_decode_downcast(encoder, decoder, nullable):
+    """
+    Numeric columns can be decoded into the smallest dtypes that hold their values. The values are unchanged.
+    """
+    with NamedTemporaryFile() as fencode:
+        encode_sample(encoder, fencode)
+        df = decoder.read_odb(fencode.name, single=True, nullable=nullable)
+        downcast = decoder.read_odb(fencode.name, single=True, nullable=nullable, downcast=True)
+
+    assert downcast["col1"].dtype == ("Int8" if nullable else "int8")
+    assert downcast["col5"].dtype == ("Int8" if nullable else "float32")
+    assert downcast["col13"].dtype == ("Int32" if nullable else "float64")
+    assert downcast["col10"].dtype == "float32"
+    assert downcast["col9"].dtype == "float64"
+    assert downcast.memory_usage().sum() < df.memory_usage().sum()
+
+    for name in df.columns:
+        numpy.testing.assert_array_equal(downcast[name].isna(), df[name].isna())
+        if df[name].dtype != object:
+            numpy.testing.assert_array_equal(
+                downcast[name].dropna().to_numpy(dtype=float), df[name].dropna().to_numpy(dtype=float)
+            )
+
+
+def test_downcast_aggregated_frames():
+    """
+    The dtypes of aggregated frames are agreed from the codecs of all of the frames
+    """
+    df = pandas.DataFrame({"a": [1, 2, 3, 4, 300, None], "b": [1.5, 2.5, 3.5, 4.5, 5.5, 6.5]})
+    with NamedTemporaryFile() as fencode:
+        pyodc.encode_odb(df, fencode.name, rows_per_frame=3, types={"b": pyodc.REAL})
+
+        (frame,) = pyodc.Reader(fencode.name).frames
+        assert frame.narrow_dtypes() == {"a": numpy.float32, "b": numpy.float32}
+        assert frame.narrow_dtypes(nullable=True) == {"a": numpy.int16, "b": numpy.float32}
+
+        for workers in (None, 2):
+            decoded = pyodc.read_odb(fencode.name, single=True, downcast=True, workers=workers)
+            assert decoded.dtypes.to_dict() == {"a": numpy.float32, "b": numpy.float32}
+            numpy.testing.assert_array_equal(decoded["a"], df["a"])
+
+        frames = list(pyodc.read_odb(fencode.name, aggregated=False, downcast=True))
+        assert [frame["a"].dtype for frame in frames] == [numpy.int8, numpy.float32]
+
+
+def test_projection_only_decodes_requested_columns(monkeypatch):
+    decoded = []
+    decode_columns = pyodc.Frame._decode_columns
+
+    def spy(self, indexes, *args):
+        decoded.append({self._column_codecs[i].column_name for i in indexes})
+        return decode_columns(self, indexes, *args)
+
+    monkeypatch.setattr(pyodc.Frame, "_decode_columns", spy)
+
+    with NamedTemporaryFile() as fencode:
+        encode_sample(pyodc, fencode)
+        df = pyodc.read_odb(fencode.name, columns=["col1", "col6"], single=True)
+
+    assert set(df.columns) == {"col1", "col6"}
+    assert decoded and all(d == {"col1", "col6"} for d in decoded)
+
+
+def test_constant_columns(monkeypatch):
+    """
+    Constant columns are reported from the frame headers, and decoded without reading the rows
+    """
+    df = pandas.DataFrame(
+        {
+            "int@hdr": [7] * 6,
+            "string@hdr": ["abcd"] * 6,
+            "long@hdr": ["a long constant string"] * 6,
+            "changing@hdr": [3] * 3 + [4] * 3,
+            "value@body": [1.5, 2.5, 3.5, 4.5, 5.5, 6.5],
+        }
+    )
+    monkeypatch.setenv("ODC_ENABLE_WRITING_LONG_STRING_CODEC", "1")
+    f = io.BytesIO()
+    pyodc.encode_odb(df, f, rows_per_frame=3)
+
+    frames = pyodc.Reader(io.BytesIO(f.getvalue()), aggregated=False).frames
+    assert frames[0].constant_columns == {
+        "int@hdr": 7,
+        "string@hdr": "abcd",
+        "long@hdr": "a long constant string",
+        "changing@hdr": 3,
+    }
+
+    # Only the columns with the same value in all of the aggregated frames are constant
+    (frame,) = pyodc.Reader(io.BytesIO(f.getvalue())).frames
+    assert set(frame.constant_columns) == {"int@hdr", "string@hdr", "long@hdr"}
+
+    def no_rows(self, data):
+        raise AssertionError("Rows should not be read")
+
+    monkeypatch.setattr(pyodc.Frame, "_row_layout", no_rows)
+    decoded = frame.dataframe(columns=["int@hdr", "string@hdr", "long@hdr", "changing@hdr"])
+    pandas.testing.assert_frame_equal(decoded, df.drop(columns="value@body"))
+
+    decoded = frame.dataframe(columns=["string@hdr", "long@hdr"], strings="categorical")
+    assert list(decoded["string@hdr"].cat.categories) == ["abcd"]
+    assert list(decoded["long@hdr"]) == list(df["long@hdr"])
+
+
+def test_encoded_row_markers():
+    """
+    Each row starts with a marker giving the first column that differs from the previous row. Rows that
+    repeat the previous row entirely still encode the last column.
+    """
+    df = pandas.DataFrame(
+        {
+            "slow@hdr": [1, 1, 1, 2, 2, 2, 3, 3],
+            "string@hdr": ["a", "a", "a", "b", "b", "b", "b", "c"],
+            "missing@hdr": [None, None, None, 4, 4, 4, 5, 5],
+            "fast@body": [1.5, 2.5, 3.5, 4.5, 4.5, 6.5, 7.5, 8.5],
+        }
+    )
+
+    f = io.BytesIO()
+    pyodc.encoder.encode_single_dataframe(df, f, column_order=list(df.columns))
+    f.seek(0)
+    frame = pyodc.Frame(f)
+
+    f.seek(frame._dataStartPosition)
+    _, markers, _ = frame._row_layout(f.read(frame._dataSize))
+    assert list(markers) == [0, 3, 3, 0, 3, 3, 0, 1]
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+@pytest.mark.parametrize("data", [[-1000.0, None, -900.0], [-100000, None, -40000, None]])
+def test_encode_decode_negative_offset_missing(odyssey, data):
+    """
+    Missing values in integer columns whose minimum is far below zero must encode as for any other minimum
+    """
+    df = pandas.DataFrame({"x@body": data})
+
+    with NamedTemporaryFile() as fout:
+        pyodc.encode_odb(df, fout.name)
+        decoded = odyssey.read_odb(fout.name, single=True)
+
+    numpy.testing.assert_array_equal(decoded["x@body"], df["x@body"].astype(float))
+
+
+def test_optimise_column_order():
+    """
+    A column that changes rarely, but in different rows to the others, is better encoded last, so that the
+    rows which repeat the others only encode that one narrow column
+    """
+    nrows = 1000
+    df = pandas.DataFrame(
+        {
+            "rare@body": (numpy.arange(nrows) + 5) // 10 % 100,
+            "even@hdr": numpy.arange(nrows) // 2 % 100,
+            "wide@hdr": numpy.repeat(numpy.linspace(0, 1, nrows // 2), 2),
+        }
+    )
+
+    ordering = pyodc.optimise_column_order(df, rows_per_frame=300)
+    assert ordering.default_order[0] == "rare@body"
+    assert ordering.column_order[2] == "rare@body"
+    assert ordering.saving > 0
+
+    # The estimated sizes are those of the encoded data sections
+    for order, size in ((None, ordering.default_size), ("optimise", ordering.encoded_size)):
+        f = io.BytesIO()
+        pyodc.encode_odb(df, f, rows_per_frame=300, column_order=order)
+        f.seek(0)
+        frames = list(pyodc.Reader(f, aggregated=False).frames)
+        assert sum(frame._dataSize for frame in frames) == size
+
+        f.seek(0)
+        assert_dataframe_equal(df, pyodc.read_odb(f, single=True))
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_sort_within_frame(odyssey):
+    """
+    Rows are reordered within, but not between, frames
+    """
+    nrows = 600
+    df = pandas.DataFrame(
+        {
+            "station@hdr": numpy.arange(nrows) % 7,
+            "time@hdr": numpy.arange(nrows) % 3,
+            "value@body": numpy.linspace(0, 1, nrows),
+        }
+    )
+
+    sizes = {}
+    for sort_within_frame in (None, ["station@hdr", "time@hdr"], "auto"):
+        with NamedTemporaryFile() as f:
+            odyssey.encode_odb(df, f, rows_per_frame=200, sort_within_frame=sort_within_frame)
+            f.flush()
+            sizes[str(sort_within_frame)] = os.path.getsize(f.name)
+            frames = list(odyssey.read_odb(f.name, aggregated=False))
+
+        assert len(frames) == 3
+        for i, frame in enumerate(frames):
+            expected = df.iloc[i * 200 : (i + 1) * 200]
+            if sort_within_frame == "auto":
+                expected = expected.sort_values(["time@hdr", "station@hdr"], kind="stable")
+            elif sort_within_frame is not None:
+                expected = expected.sort_values(sort_within_frame, kind="stable")
+            assert_dataframe_equal(expected.reset_index(drop=True), frame)
+
+    assert sizes["auto"] < sizes["None"]
+    assert sizes[str(["station@hdr", "time@hdr"])] < sizes["None"]
+
+    with pytest.raises(ValueError):
+        odyssey.encode_odb(df, io.BytesIO(), sort_within_frame="unknown")
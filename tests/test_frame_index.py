@@ -0,0 +1,81 @@
+import io
+import os
+import shutil
+
+import pandas
+import pytest
+
+import pyodc
+
+data_file1 = os.path.join(os.path.dirname(__file__), "data/data1.odb")
+
+
+@pytest.fixture
+def data_copy(tmp_path):
+    path = str(tmp_path / "data1.odb")
+    shutil.copy(data_file1, path)
+    return path
+
+
+@pytest.mark.parametrize("aggregated", [True, False])
+def test_index_built_and_reused(data_copy, aggregated):
+    scanned = pyodc.Reader(data_copy, aggregated=aggregated)
+    assert not os.path.exists(data_copy + ".idx")
+
+    built = pyodc.Reader(data_copy, aggregated=aggregated, index=True)
+    assert os.path.exists(data_copy + ".idx")
+
+    # On reopening, no frames are read until they are requested
+    indexed = pyodc.Reader(data_copy, aggregated=aggregated, index=True)
+    assert indexed._frames is None
+
+    assert indexed.row_offsets == scanned.row_offsets == built.row_offsets
+    last = len(scanned.frames) - 1
+    pandas.testing.assert_frame_equal(indexed.frame(last).dataframe(), scanned.frames[last].dataframe())
+
+    assert len(indexed.frames) == len(scanned.frames)
+    for f1, f2 in zip(indexed.frames, scanned.frames):
+        assert f1.nrows == f2.nrows
+        assert f1.properties == f2.properties
+        pandas.testing.assert_frame_equal(f1.dataframe(), f2.dataframe())
+
+
+def test_stale_index_rebuilt(data_copy, tmp_path):
+    index_file = str(tmp_path / "explicit.idx")
+    pyodc.read_odb(data_copy, single=True, index=index_file)
+
+    # Replace the file with different content
+    df = pandas.DataFrame({"a": range(25), "b": ["x", "y", "z", "w", "v"] * 5})
+    pyodc.encode_odb(df, data_copy, rows_per_frame=10)
+
+    r = pyodc.Reader(data_copy, aggregated=False, index=index_file)
+    assert r.row_offsets == [0, 10, 20]
+    pandas.testing.assert_frame_equal(pyodc.read_odb(data_copy, single=True, index=index_file), df)
+
+
+def test_index_groups_match_aggregation(tmp_path):
+    """
+    The index groups frames into logical frames using the same column structure as live aggregation
+    """
+    path = str(tmp_path / "mixed.odb")
+    df = pandas.DataFrame({"a@hdr": [1, 2] * 10, "b@body": [1.5, 2.5] * 10})
+    with open(path, "wb") as f:
+        pyodc.encode_odb(df, f, rows_per_frame=4)
+        pyodc.encode_odb(df.rename(columns={"b@body": "c@body"}), f, rows_per_frame=4)
+        pyodc.encode_odb(df.astype({"b@body": "float32"}), f, rows_per_frame=4)
+
+    scanned = pyodc.Reader(path, aggregated=True)
+    pyodc.Reader(path, aggregated=True, index=True)
+    indexed = pyodc.Reader(path, aggregated=True, index=True)
+    assert indexed._frames is None
+
+    assert [f.nrows for f in indexed.frames] == [f.nrows for f in scanned.frames] == [20, 20, 20]
+    assert indexed.row_offsets == scanned.row_offsets
+
+
+def test_index_requires_path():
+    with open(data_file1, "rb") as f:
+        data = f.read()
+
+    with pytest.raises(ValueError):
+        pyodc.Reader(io.BytesIO(data), index=True)
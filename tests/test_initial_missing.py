@@ -56,3 +56,12 @@ def test_initial_missing2(odyssey):
     assert set(check_df.columns) == set(df.columns)
     for col in df.columns:
         numpy.testing.assert_array_equal(df[col], check_df[col])
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_initial_missing_categorical(odyssey):
+    data_file = os.path.join(os.path.dirname(__file__), "data/odb_533_1.odb")
+    df = odyssey.read_odb(data_file, single=True, strings="categorical")
+
+    assert isinstance(df["stringval"].dtype, pandas.CategoricalDtype)
+    assert list(df["stringval"]) == ["", "testing"]
@@ -1,11 +1,14 @@
 import io
+import warnings
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from pyodc import codec
 from pyodc.codec import select_codec
-from pyodc.stream import LittleEndianStream
+from pyodc.constants import DataType
+from pyodc.stream import BigEndianStream, LittleEndianStream
 
 
 def _check_encode(codec, series, encode_compare):
@@ -122,3 +125,122 @@ def test_int16_missing_range_encoding_maximal():
         assert c.min == 1 + offset
 
     _check_encode(c, s, b"\x00\x00\xff\xff\xfe\xff")
+
+
+@pytest.mark.parametrize(
+    "data, data_type",
+    [
+        ((1, 2, 2**8), None),
+        ((1, None, 2**8 - 1), None),
+        ((-100, 2**8 - 100, 2**16 - 100), None),
+        ((1, None, 2**16 - 1), None),
+        ((-(2**31), None, 2**31 - 2), None),
+        ((7, 7, 7), None),
+        ((7, None, 7), None),
+        ((-1000, None, -900), None),
+        ((-100000, None, -100000 + 2**16 - 2), None),
+        ((1.5, 2.5, -3.25), DataType.REAL),
+    ],
+)
+@pytest.mark.parametrize("byteorder", ["little", "big"])
+def test_array_encoding(data, data_type, byteorder):
+    """
+    The bulk encoders and decoders must be interchangeable with the per-value ones
+    """
+    s = pd.Series(data)
+    c = select_codec("column", s, data_type, None)
+
+    f = io.BytesIO()
+    st = (LittleEndianStream if byteorder == "little" else BigEndianStream)(f)
+    for v in s:
+        c.encode(st, v)
+
+    encoded = c.encode_array(s, byteorder=byteorder)
+    assert encoded == f.getvalue()
+
+    offsets = [i * c.encoded_size for i in range(len(s))]
+    decoded = c.decode_array(encoded, offsets, byteorder=byteorder)
+    pd.testing.assert_series_equal(pd.Series(decoded), s, check_dtype=False)
+
+
+@pytest.mark.parametrize("nullable", [False, True])
+@pytest.mark.parametrize(
+    "data, data_type",
+    [
+        ((-100, 27, 155), None),
+        ((-128, 0, 127), None),
+        ((-1000, None, -900), None),
+        ((0, None, 2**16 - 2), None),
+        ((-(2**20), 5, 2**20), None),
+        ((-(2**20), None, 2**20), None),
+        ((1.5, None, -3.25), DataType.REAL),
+    ],
+)
+def test_array_decoding_narrow(data, data_type, nullable):
+    """
+    Values are decoded directly into the narrow dtype of the codec, with the same values as the default decoding
+    """
+    s = pd.Series(data)
+    c = select_codec("column", s, data_type, None)
+    dtype = c.narrow_dtype(s.hasnans, nullable)
+    assert dtype is not None
+
+    buffer = np.frombuffer(c.encode_array(s), dtype=np.uint8)
+    offsets = np.arange(len(s)) * c.encoded_size
+    values, missing = c._decode_array(buffer, offsets, "little", dtype)
+    expected, expected_missing = c._decode_array(buffer, offsets, "little")
+
+    assert values.dtype == dtype
+    np.testing.assert_array_equal(missing, expected_missing)
+    present = ~expected_missing if expected_missing is not None else slice(None)
+    np.testing.assert_array_equal(values[present], expected[present])
+
+
+@pytest.mark.parametrize("byteorder", ["little", "big"])
+def test_array_encoding_real_overflow(byteorder):
+    """
+    Finite values beyond single precision must not silently become inf when encoded in bulk
+    """
+    s = pd.Series([1.5, 1e300, 2.5])
+    c = select_codec("column", s, DataType.REAL, None)
+
+    st = (LittleEndianStream if byteorder == "little" else BigEndianStream)(io.BytesIO())
+    with pytest.raises(OverflowError):
+        for v in s:
+            c.encode(st, v)
+
+    with pytest.raises(OverflowError):
+        c.encode_array(s, byteorder=byteorder)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        (1, 2, 2, 5, 5, 5, -3),
+        (1.0, None, None, 4.0, 4.0),
+        (0.5, 0.5, float("inf"), float("inf"), None),
+        (1.0, float("-inf"), 2.0),
+        ("a", "b", "b", "a"),
+        (None, None, 1.0),
+    ],
+)
+def test_column_statistics(data):
+    """
+    The single pass statistics must agree with the equivalent pandas operations
+    """
+    s = pd.Series(data)
+    stats = codec.ColumnStatistics(s)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        if s.dtype != object:
+            assert stats.is_integral == (s.dropna() % 1 == 0).all()
+
+    assert stats.has_missing == s.hasnans
+    assert stats.all_missing == s.isnull().all()
+    assert stats.cardinality == s.nunique()
+    if s.dtype == object:
+        assert stats.num_changes() == (s != s.shift()).sum() - 1
+    else:
+        assert stats.min == s.min() and stats.max == s.max()
+        assert stats.num_changes(-1) == (s.fillna(-1).diff() != 0).sum() - 1
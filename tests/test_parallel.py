@@ -0,0 +1,115 @@
+import io
+import os
+from tempfile import NamedTemporaryFile
+
+import numpy
+import pandas
+import pytest
+from conftest import odc_modules
+
+import pyodc
+
+data_file1 = os.path.join(os.path.dirname(__file__), "data/data1.odb")
+
+
+@pytest.fixture(scope="module")
+def multi_frame_file():
+    df = pandas.DataFrame(
+        {
+            "station@hdr": numpy.repeat(numpy.arange(50), 20),
+            "value@body": numpy.linspace(0, 1, 1000),
+            "name@hdr": numpy.repeat([f"stn{i}" for i in range(50)], 20),
+        }
+    )
+    with NamedTemporaryFile(suffix=".odb") as f:
+        pyodc.encode_odb(df, f, rows_per_frame=70)
+        # A second, differently structured, set of frames to stop everything aggregating together
+        pyodc.encode_odb(df[["value@body"]], f, rows_per_frame=300)
+        f.flush()
+        yield f.name
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+@pytest.mark.parametrize("aggregated", [True, False])
+@pytest.mark.parametrize("columns", [None, ["value"]])
+def test_parallel_decode_in_order(odyssey, multi_frame_file, aggregated, columns):
+    serial = list(odyssey.read_odb(multi_frame_file, aggregated=aggregated, columns=columns))
+    parallel = list(odyssey.read_odb(multi_frame_file, aggregated=aggregated, columns=columns, workers=3))
+
+    assert len(parallel) == len(serial) > 1
+    for df1, df2 in zip(parallel, serial):
+        pandas.testing.assert_frame_equal(df1, df2)
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_parallel_decode_single(odyssey, multi_frame_file):
+    pandas.testing.assert_frame_equal(
+        odyssey.read_odb(multi_frame_file, single=True, workers=2),
+        odyssey.read_odb(multi_frame_file, single=True),
+    )
+
+
+@pytest.mark.parametrize("memory_map", [None, True, False])
+def test_parallel_decode_memory_map(multi_frame_file, memory_map):
+    pandas.testing.assert_frame_equal(
+        pyodc.read_odb(multi_frame_file, single=True, workers=2, memory_map=memory_map),
+        pyodc.read_odb(multi_frame_file, single=True),
+    )
+
+
+@pytest.mark.parametrize("memory_map, mapped", [(None, True), (False, False)])
+def test_parallel_worker_file(monkeypatch, memory_map, mapped):
+    """
+    Each worker opens the file once, and only memory maps it if the caller allows this
+    """
+    monkeypatch.setattr(pyodc.reader, "_worker_file", None)
+    pyodc.reader._open_worker_file(data_file1, memory_map)
+    f = pyodc.reader._worker_file
+    try:
+        assert isinstance(f, pyodc.stream.BufferReader) == mapped
+    finally:
+        if not mapped:
+            f.close()
+
+
+def test_parallel_decode_file_object():
+    with open(data_file1, "rb") as f:
+        df = pyodc.read_odb(f, single=True, workers=2)
+    pandas.testing.assert_frame_equal(df, pyodc.read_odb(data_file1, single=True))
+
+
+def test_parallel_decode_missing_column(multi_frame_file):
+    with pytest.raises(KeyError):
+        pyodc.read_odb(multi_frame_file, columns=["missing-column"], single=True, workers=2)
+
+
+def test_parallel_decode_bitfields():
+    columns = ["datum_status.active@body", "report_rdbflag.lat_flag@hdr", "lat@hdr"]
+    pandas.testing.assert_frame_equal(
+        pyodc.read_odb(data_file1, columns=columns, single=True, workers=2),
+        pyodc.read_odb(data_file1, columns=columns, single=True),
+    )
+
+
+@pytest.mark.parametrize("bigendian", [False, True])
+def test_parallel_encode_identical(bigendian):
+    df = pandas.DataFrame(
+        {
+            "station@hdr": numpy.repeat(numpy.arange(50), 20),
+            "value@body": numpy.linspace(0, 1, 1000),
+            "flag@body": numpy.where(numpy.arange(1000) % 7 == 0, numpy.nan, numpy.arange(1000) % 3),
+            "name@hdr": numpy.repeat([f"stn{i}" for i in range(50)], 20),
+        }
+    )
+    serial = io.BytesIO()
+    parallel = io.BytesIO()
+    pyodc.encode_odb(df, serial, rows_per_frame=90, bigendian=bigendian, properties={"key": "value"})
+    pyodc.encode_odb(df, parallel, rows_per_frame=90, bigendian=bigendian, properties={"key": "value"}, workers=3)
+
+    assert parallel.getvalue() == serial.getvalue()
+
+
+def test_parallel_encode_empty():
+    f = io.BytesIO()
+    pyodc.encode_odb(pandas.DataFrame({"a": []}), f, workers=2)
+    assert f.getvalue() == b""
@@ -0,0 +1,65 @@
+import io
+import os
+import subprocess
+import sys
+
+import pandas
+import pytest
+
+import pyodc
+
+data_file1 = os.path.join(os.path.dirname(__file__), "data/data1.odb")
+
+
+class ReadOnlyStream:
+    """A minimal stream which only supports read(), returning data in small chunks"""
+
+    def __init__(self, data, chunk_size=7):
+        self._f = io.BytesIO(data)
+        self._chunk_size = chunk_size
+
+    def read(self, n=-1):
+        return self._f.read(min(n, self._chunk_size))
+
+
+@pytest.fixture
+def data1():
+    with open(data_file1, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("aggregated", [True, False])
+def test_read_from_pipe(aggregated):
+    expected = list(pyodc.read_odb(data_file1, aggregated=aggregated))
+
+    cmd = [sys.executable, "-c", f"import sys; sys.stdout.buffer.write(open({data_file1!r}, 'rb').read())"]
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+        assert not proc.stdout.seekable()
+        decoded = list(pyodc.read_odb(proc.stdout, aggregated=aggregated))
+
+    assert len(decoded) == len(expected)
+    for df1, df2 in zip(decoded, expected):
+        pandas.testing.assert_frame_equal(df1, df2)
+
+
+def test_read_from_read_only_stream(data1):
+    r = pyodc.Reader(ReadOnlyStream(data1), aggregated=False)
+    assert len(r.frames) == 11
+    assert sum(f.nrows for f in r.frames) == 13
+
+    pandas.testing.assert_frame_equal(
+        pyodc.read_odb(ReadOnlyStream(data1), single=True),
+        pyodc.read_odb(data_file1, single=True),
+    )
+
+
+def test_truncated_stream(data1):
+    with pytest.raises(ValueError):
+        pyodc.read_odb(ReadOnlyStream(data1[:-10]), single=True)
+
+
+def test_forward_only_options(data1):
+    with pytest.raises(ValueError):
+        pyodc.Reader(ReadOnlyStream(data1), memory_map=True)
+    with pytest.raises(ValueError):
+        pyodc.Reader(ReadOnlyStream(data1), index="unused.idx")
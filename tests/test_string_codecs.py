@@ -73,10 +73,18 @@ def check_codec_choice(testdata, expected_codec):
     assert decoded_codec.name == selected_codec.name
 
     # Check the encoded data matches
+    data_position = st.position()
     for val in testdata:
         decoded_val = selected_codec.decode(st)
         assert val == decoded_val
 
+    # And that the bulk encoder and decoder are equivalent
+    encoded = selected_codec.encode_array(series)
+    assert encoded == f.getvalue()[data_position:]
+
+    offsets = [i * selected_codec.encoded_size for i in range(len(testdata))]
+    assert list(selected_codec.decode_array(encoded, offsets)) == testdata
+
 
 def test_string_codec_selection():
     # Deliberately using strings on length 7,8,9 to catch edges cases
@@ -148,3 +156,33 @@ def test_new_strings(encoder, decoder, testcase, type):
 
     # Check the data round tripped
     numpy.testing.assert_array_equal(df.iloc[0].values, round_tripped_data.iloc[0].values)
+
+
+@pytest.mark.parametrize("encoder", odc_modules)
+@pytest.mark.parametrize("decoder", odc_modules)
+@pytest.mark.parametrize("testcase", testcases)
+def test_categorical_strings(encoder, decoder, testcase):
+    """
+    Strings decoded as categoricals keep their values, and remain categorical with unified categories when frames
+    with different dictionaries are combined
+    """
+    testcase, codec = testcase
+    df = pd.DataFrame({"strings": testcase, "other": ["x"] * 3 + ["y"] * (len(testcase) - 3)})
+
+    with NamedTemporaryFile() as fencode:
+        encoder.encode_odb(df, fencode.name, rows_per_frame=3)
+        for workers in (None, 2):
+            decoded = decoder.read_odb(fencode.name, single=True, strings="categorical", workers=workers)
+            for name in df.columns:
+                assert isinstance(decoded[name].dtype, pd.CategoricalDtype)
+                assert list(decoded[name]) == list(df[name])
+
+        frames = list(decoder.read_odb(fencode.name, aggregated=False, strings="categorical"))
+        assert list(frames[0]["other"].cat.categories) == ["x"]
+        assert list(frames[1]["other"].cat.categories) == ["y"]
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_categorical_strings_invalid(odyssey):
+    with pytest.raises(ValueError):
+        odyssey.read_odb(os.path.join(os.path.dirname(__file__), "data/data1.odb"), strings="bytes")
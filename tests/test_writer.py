@@ -0,0 +1,257 @@
+import io
+from tempfile import NamedTemporaryFile
+
+import numpy
+import pandas
+import pytest
+from conftest import odc_modules
+
+import pyodc
+
+
+def sample_dataframe(nrows):
+    return pandas.DataFrame(
+        {
+            "station@hdr": numpy.arange(nrows) // 10,
+            "value@body": numpy.linspace(0, 1, nrows),
+            "name@hdr": [f"stn{i // 10}" for i in range(nrows)],
+        }
+    )
+
+
+def test_writer_matches_encode_odb():
+    df = sample_dataframe(1000)
+
+    expected = io.BytesIO()
+    pyodc.encode_odb(df, expected, rows_per_frame=120)
+
+    f = io.BytesIO()
+    writer = pyodc.Writer(f, rows_per_frame=120)
+    for start, end in ((0, 7), (7, 300), (300, 301), (301, 1000)):
+        writer.append(df.iloc[start:end])
+    writer.close()
+
+    assert f.getvalue() == expected.getvalue()
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_writer_stable_frames(odyssey):
+    """
+    The column order and types are fixed by the first frame, so that all the frames can be aggregated
+    """
+    first = pandas.DataFrame({"a": numpy.arange(5), "b": numpy.arange(5, dtype="float32") / 2})
+    second = pandas.DataFrame({"b": numpy.full(5, 0.25), "a": numpy.arange(5)})
+
+    with NamedTemporaryFile() as f:
+        with pyodc.Writer(f.name, rows_per_frame=5) as writer:
+            writer.append(first)
+            writer.append(second)
+
+        frames = list(odyssey.read_odb(f.name))
+        assert len(frames) == 1
+        assert len(list(odyssey.read_odb(f.name, aggregated=False))) == 2
+
+    numpy.testing.assert_array_equal(frames[0]["a"], numpy.tile(numpy.arange(5), 2))
+    numpy.testing.assert_array_equal(frames[0]["b"], [0, 0.5, 1, 1.5, 2] + [0.25] * 5)
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_writer_float_whole_first_frame(odyssey):
+    """
+    A float column that is whole in the first frame must still accept fractional values in later frames
+    """
+    df = pandas.DataFrame({"a": [1.0, 2.0, 3.0, 2.5, 3.5, 4.5]})
+
+    with NamedTemporaryFile() as f:
+        with pyodc.Writer(f.name, rows_per_frame=3) as writer:
+            writer.append(df)
+
+        frames = list(odyssey.read_odb(f.name))
+        assert len(frames) == 1
+
+    numpy.testing.assert_array_equal(frames[0]["a"], df["a"])
+
+
+def test_writer_closed():
+    f = io.BytesIO()
+    writer = pyodc.Writer(f)
+    writer.append(sample_dataframe(10))
+    assert f.getvalue() == b""
+
+    writer.close()
+    assert len(pyodc.read_odb(io.BytesIO(f.getvalue()), single=True)) == 10
+
+    with pytest.raises(ValueError):
+        writer.append(sample_dataframe(10))
+
+
+def batches(df, sizes):
+    start = 0
+    for size in sizes:
+        yield df.iloc[start : start + size]
+        start += size
+
+
+def test_encode_iterable_matches_dataframe():
+    df = sample_dataframe(1000)
+
+    expected = io.BytesIO()
+    pyodc.encode_odb(df, expected, rows_per_frame=120)
+
+    f = io.BytesIO()
+    pyodc.encode_odb(batches(df, [7, 293, 1, 0, 699]), f, rows_per_frame=120)
+    assert f.getvalue() == expected.getvalue()
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+def test_encode_iterable(odyssey):
+    df = sample_dataframe(100)
+    dicts = ({name: data.to_numpy() for name, data in batch.items()} for batch in batches(df, [30, 45, 25]))
+
+    with NamedTemporaryFile() as f:
+        odyssey.encode_odb(dicts, f, rows_per_frame=40)
+        f.flush()
+
+        assert [len(frame) for frame in odyssey.read_odb(f.name, aggregated=False)] == [40, 40, 20]
+        decoded = odyssey.read_odb(f.name, single=True)
+
+    pandas.testing.assert_frame_equal(decoded[df.columns], df)
+
+
+def test_encode_record_batches():
+    pyarrow = pytest.importorskip("pyarrow")
+    df = sample_dataframe(100)
+    record_batches = pyarrow.Table.from_pandas(df, preserve_index=False).to_batches(max_chunksize=30)
+
+    f = io.BytesIO()
+    pyodc.encode_odb(record_batches, f, rows_per_frame=40)
+    f.seek(0)
+    pandas.testing.assert_frame_equal(pyodc.read_odb(f, single=True)[df.columns], df)
+
+
+def test_encode_split_methods(monkeypatch):
+    df = sample_dataframe(1000)
+
+    by_groupby = io.BytesIO()
+    pyodc.encode_odb(df, by_groupby, rows_per_frame=120, split="groupby")
+
+    # Slicing hands views of the original data to the encoder, rather than copies
+    shared = []
+    encode_single_dataframe = pyodc.encoder.encode_single_dataframe
+
+    def spy(sub_df, *args, **kwargs):
+        shared.append(numpy.shares_memory(sub_df["value@body"].to_numpy(), df["value@body"].to_numpy()))
+        return encode_single_dataframe(sub_df, *args, **kwargs)
+
+    monkeypatch.setattr(pyodc.encoder, "encode_single_dataframe", spy)
+
+    by_slice = io.BytesIO()
+    pyodc.encode_odb(df, by_slice, rows_per_frame=120)
+
+    assert by_slice.getvalue() == by_groupby.getvalue()
+    assert len(shared) == 9 and all(shared)
+
+    with pytest.raises(ValueError):
+        pyodc.encode_odb(df, io.BytesIO(), split="unknown")
+
+
+@pytest.mark.parametrize("odyssey", odc_modules)
+@pytest.mark.parametrize("ncolumns", [1, 10])
+def test_target_frame_bytes(odyssey, ncolumns):
+    """
+    Frames hold as many rows as fit in about the target size, however wide the table
+    """
+    rng = numpy.random.default_rng(0)
+    df = pandas.DataFrame({f"column{i}": rng.random(5000) for i in range(ncolumns)})
+    df["station@hdr"] = numpy.arange(5000) // 10
+
+    with NamedTemporaryFile() as f:
+        odyssey.encode_odb(df, f, target_frame_bytes=20000)
+        f.flush()
+
+        frames = pyodc.Reader(f.name, aggregated=False).frames
+        assert sum(frame.nrows for frame in frames) == 5000
+        for frame in frames[:-1]:
+            assert 15000 <= frame._dataSize <= 25000
+
+        pandas.testing.assert_frame_equal(odyssey.read_odb(f.name, single=True)[df.columns], df)
+
+
+@pytest.mark.parametrize("split", ["slice", "groupby"])
+def test_target_frame_bytes_split(split):
+    """
+    Frames sized by bytes are sliced by size, so an explicit split method is rejected rather than ignored
+    """
+    with pytest.raises(ValueError):
+        pyodc.encode_odb(sample_dataframe(100), io.BytesIO(), target_frame_bytes=2000, split=split)
+
+
+def test_target_frame_bytes_iterable():
+    df = sample_dataframe(1000)
+    f = io.BytesIO()
+    pyodc.encode_odb(batches(df, [100] * 10), f, target_frame_bytes=2000)
+    f.seek(0)
+
+    frames = pyodc.Reader(f, aggregated=False).frames
+    assert len(frames) > 1
+    assert all(frame._dataSize <= 3000 for frame in frames)
+    f.seek(0)
+    pandas.testing.assert_frame_equal(pyodc.read_odb(f, single=True)[df.columns], df)
+
+
+class RecordingStream(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+
+def test_one_write_per_frame():
+    df = sample_dataframe(1000)
+
+    # Later frames are smaller than the first, so they are assembled in a reused buffer
+    target = RecordingStream()
+    pyodc.encode_odb(df, target, rows_per_frame=300)
+    assert target.writes == 4
+
+    written = RecordingStream()
+    with pyodc.Writer(written, rows_per_frame=300) as writer:
+        writer.append(df)
+    assert written.writes == 4
+    assert written.getvalue() == target.getvalue()
+
+    frames = list(pyodc.read_odb(io.BytesIO(target.getvalue()), aggregated=False))
+    assert [len(frame) for frame in frames] == [300, 300, 300, 100]
+    for start, frame in zip(range(0, 1000, 300), frames):
+        numpy.testing.assert_array_equal(frame["station@hdr"], df["station@hdr"].iloc[start : start + 300])
+        assert list(frame["name@hdr"]) == list(df["name@hdr"].iloc[start : start + 300])
+
+
+class CollectingTarget:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+        return len(data)
+
+
+def test_frames_outlive_buffer_reuse():
+    """
+    Targets that keep the objects written to them must not see earlier frames overwritten by later ones
+    """
+    df = sample_dataframe(1000)
+    expected = io.BytesIO()
+    pyodc.encode_odb(df, expected, rows_per_frame=300)
+
+    target = CollectingTarget()
+    pyodc.encode_odb(df, target, rows_per_frame=300)
+    assert b"".join(target.chunks) == expected.getvalue()
+
+    written = CollectingTarget()
+    with pyodc.Writer(written, rows_per_frame=300) as writer:
+        writer.append(df)
+    assert b"".join(written.chunks) == expected.getvalue()